@@ -0,0 +1,144 @@
+# ==========================================================
+# ⚙️ ANALYSIS WORKER POOL
+# Multi-process FFT backend for concurrent live sessions
+# ==========================================================
+#
+# Every AlphaResonanceProcessor in "process" mode stacks its windowed
+# STFT frames into its own shared-memory block and ships only the
+# block name to a process-wide pool. Workers attach to the block, run
+# one batched rfft + band reduction (+ F0) and send back the tiny sums,
+# so FFT throughput scales with cores instead of the GIL.
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from resonance_dsp import ResonanceScorer, get_pitch_tracker, PROFILES
+
+
+# Worker processes (default: one per core)
+POOL_WORKERS = int(os.getenv("ALPHA_ANALYSIS_WORKERS", "0")) or os.cpu_count() or 1
+
+# Hops stacked per round trip (8 x 1024 @ 48 kHz ≈ 170 ms)
+BATCH_HOPS = 8
+
+# Workers must not fork the server: it runs Streamlit / aiortc threads,
+# and a forked child inherits their locks in whatever state they were
+POOL_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool(workers=None):
+    # One pool per server process, shared by every Streamlit session
+    global _pool
+
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=workers or POOL_WORKERS,
+                                        mp_context=multiprocessing.get_context(POOL_START_METHOD))
+        return _pool
+
+
+def shutdown_pool():
+    global _pool
+
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+# ----------------------------------------------------------
+# 🧮 WORKER SIDE
+# ----------------------------------------------------------
+@lru_cache(maxsize=16)
+def _worker_scorer(profile_name, sample_rate, window):
+    # worker processes are single-threaded: one scorer per shape
+    return ResonanceScorer(PROFILES[profile_name], sample_rate, window,
+                           max_batch=BATCH_HOPS)
+
+
+def _zones_and_pitch(scorer, frames):
+    zones, totals = scorer.zones(frames)
+    f0, _ = get_pitch_tracker(scorer.sample_rate, scorer.n_samples).from_magnitude(
+        scorer.magnitude(len(frames)))
+    return zones, totals, f0
+
+
+def _score_shared_batch(shm_name, count, window, sample_rate, profile_name):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        frames = np.ndarray((count, window), dtype=np.float32, buffer=shm.buf)
+        scorer = _worker_scorer(profile_name, sample_rate, window)
+        zones, totals, f0 = _zones_and_pitch(scorer, frames)
+        del frames
+        return zones.copy(), totals.copy(), f0
+    finally:
+        shm.close()
+
+
+# ----------------------------------------------------------
+# 📦 SESSION SIDE
+# ----------------------------------------------------------
+class SharedFrameBatch:
+
+    # Preallocated (capacity, window) float32 block in shared memory.
+    # Owned by a single processor thread; reused after every round trip.
+
+    def __init__(self, window, sample_rate, profile_name, capacity=BATCH_HOPS):
+        self.window = window
+        self.sample_rate = sample_rate
+        self.profile_name = profile_name
+        self.capacity = capacity
+        self.count = 0
+        self._local = None
+
+        self._shm = shared_memory.SharedMemory(
+            create=True,
+            size=capacity * window * np.dtype(np.float32).itemsize
+        )
+        self.frames = np.ndarray((capacity, window), dtype=np.float32,
+                                 buffer=self._shm.buf)
+
+    @property
+    def full(self):
+        return self.count == self.capacity
+
+    def add(self, frame):
+        self.frames[self.count] = frame
+        self.count += 1
+
+    def score(self):
+        # Blocks the calling (analysis) thread until a worker is done,
+        # then the block is free to refill.
+        if self.count == 0:
+            return None
+
+        count, self.count = self.count, 0
+        try:
+            future = get_pool().submit(
+                _score_shared_batch, self._shm.name, count,
+                self.window, self.sample_rate, self.profile_name
+            )
+            return future.result()
+        except Exception:
+            # pool unavailable / broken — score in this process instead
+            if self._local is None:
+                self._local = ResonanceScorer(PROFILES[self.profile_name],
+                                              self.sample_rate, self.window,
+                                              max_batch=self.capacity)
+            zones, totals, f0 = _zones_and_pitch(self._local, self.frames[:count])
+            return zones.copy(), totals.copy(), f0
+
+    def close(self):
+        self.frames = None
+        self._shm.close()
+        self._shm.unlink()
@@ -0,0 +1,242 @@
+# ==========================================================
+# 🗂 BATCH SCORING
+# Re-score stored WAV / raw PCM drill recordings offline
+# ==========================================================
+#
+#   python batch_scoring.py recordings/ --workers 8 --out scores.csv
+#
+# Files are memory-mapped and gated by the same EnergyVad as the live
+# and mic paths: only speech frames are kept (as in
+# voice_engine.score_buffer), then cut into equal-length Hann windows
+# and scored with one rfft(axis=-1) per block of windows.
+
+import argparse
+import csv
+import os
+import struct
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from resonance_dsp import ResonanceScorer, LAB_PROFILE, get_pitch_tracker
+from voice_activity import EnergyVad
+from voice_engine import score_zones, silent_result, STREAM_WINDOW, STREAM_HOP
+
+
+AUDIO_EXTENSIONS = (".wav", ".pcm", ".raw")
+
+# Raw .pcm / .raw files carry no header: assume mono int16 at this rate
+RAW_SAMPLE_RATE = 44100
+
+# Windows per rfft call — bounds memory on hour-long files
+WINDOWS_PER_BLOCK = 256
+
+RESULT_FIELDS = ["path", "sub100", "chest", "gravel", "belly", "alpha", "pitch", "f0",
+                 "speech_detected"]
+
+_WAV_DTYPES = {
+    (1, 8): np.uint8,
+    (1, 16): np.int16,
+    (1, 32): np.int32,
+    (3, 32): np.float32,
+    (3, 64): np.float64,
+}
+
+
+# ----------------------------------------------------------
+# 📼 FILE ACCESS
+# ----------------------------------------------------------
+def _map_wav(path):
+    # Walk the RIFF chunks ourselves so we can memmap the data chunk
+    with open(path, "rb") as f:
+        header = f.read(12)
+        if len(header) < 12 or header[:4] != b"RIFF" or header[8:] != b"WAVE":
+            raise ValueError(f"{path}: not a RIFF/WAVE file")
+
+        fmt = None
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                raise ValueError(f"{path}: no data chunk")
+
+            chunk_id, size = struct.unpack("<4sI", header)
+
+            if chunk_id == b"fmt ":
+                fmt_chunk = f.read(size)
+                if len(fmt_chunk) < 16:
+                    raise ValueError(f"{path}: truncated fmt chunk")
+                fmt = struct.unpack("<HHIIHH", fmt_chunk[:16])
+                f.seek(size & 1, os.SEEK_CUR)
+            elif chunk_id == b"data":
+                offset = f.tell()
+                break
+            else:
+                f.seek(size + (size & 1), os.SEEK_CUR)
+
+    if fmt is None:
+        raise ValueError(f"{path}: no fmt chunk")
+
+    tag, channels, sample_rate, _, _, bits = fmt
+    if tag == 0xFFFE:
+        # WAVE_FORMAT_EXTENSIBLE: the real format code is the first two
+        # bytes of the SubFormat GUID (cbSize >= 22, GUID at byte 24)
+        cb_size = struct.unpack("<H", fmt_chunk[16:18])[0] if len(fmt_chunk) >= 18 else 0
+        if cb_size < 22 or len(fmt_chunk) < 40:
+            raise ValueError(f"{path}: extensible WAV without a SubFormat")
+        tag = struct.unpack("<H", fmt_chunk[24:26])[0]
+        if tag not in (1, 3):
+            raise ValueError(f"{path}: unsupported extensible WAV subformat {tag:#06x}")
+
+    dtype = _WAV_DTYPES.get((tag, bits))
+    if dtype is None:
+        raise ValueError(f"{path}: unsupported WAV format {tag}/{bits}-bit")
+
+    n_frames = size // (channels * np.dtype(dtype).itemsize)
+    data = np.memmap(path, dtype=dtype, mode="r", offset=offset,
+                     shape=(n_frames, channels))
+    return data, sample_rate
+
+
+def load_audio(path, raw_sample_rate=RAW_SAMPLE_RATE):
+    # -> (memmap of shape (frames, channels), sample_rate)
+    if path.lower().endswith(".wav"):
+        return _map_wav(path)
+
+    data = np.memmap(path, dtype=np.int16, mode="r")
+    return data.reshape(-1, 1), raw_sample_rate
+
+
+def _to_float(block):
+    # int PCM -> float32 in [-1, 1], channels mixed down to mono
+    if block.dtype == np.uint8:
+        block = (block.astype(np.float32) - 128) / 128
+    elif block.dtype.kind == "i":
+        block = block.astype(np.float32) / np.iinfo(block.dtype).max
+    else:
+        block = block.astype(np.float32)
+
+    return block.mean(axis=1) if block.shape[1] > 1 else block[:, 0]
+
+
+# ----------------------------------------------------------
+# 🧮 SCORING
+# ----------------------------------------------------------
+def score_file(path, window=STREAM_WINDOW, hop=STREAM_HOP,
+               raw_sample_rate=RAW_SAMPLE_RATE):
+
+    data, sample_rate = load_audio(path, raw_sample_rate)
+    n = data.shape[0]
+    scorer = ResonanceScorer(LAB_PROFILE, sample_rate, window,
+                             taper=True, max_batch=WINDOWS_PER_BLOCK)
+    tracker = get_pitch_tracker(sample_rate, window)
+
+    vad = EnergyVad(sample_rate)
+    f = vad.frame_len
+
+    zones_acc = np.zeros(scorer.n_bands)
+    total_acc = 0.0
+    f0s = []
+    speech_samples = 0
+
+    def score(frames):
+        nonlocal zones_acc, total_acc
+        zones, totals = scorer.zones(frames)
+        zones_acc += zones.sum(axis=0)
+        total_acc += totals.sum()
+
+        # pitch from the same spectra (autocorrelation only, no new FFT)
+        f0, _ = tracker.from_magnitude(scorer.magnitude(len(frames)))
+        f0s.append(f0[f0 > 0])
+
+    # VAD blocks are whole VAD frames; speech is compacted into `pending`,
+    # whose last (window - hop) samples carry over so windows span blocks
+    step = max(1, WINDOWS_PER_BLOCK * hop // f) * f
+    pending = np.zeros(0, dtype=np.float32)
+    for start in range(0, n, step):
+        block = _to_float(data[start:start + step])
+        speech = vad.mask(block, seed=start == 0)
+        if not speech.any():
+            continue
+
+        kept = block[:len(speech) * f].reshape(-1, f)[speech].ravel()
+        speech_samples += len(kept)
+        pending = np.concatenate([pending, kept])
+
+        if len(pending) >= window:
+            frames = sliding_window_view(pending, window)[::hop]
+            for i in range(0, len(frames), WINDOWS_PER_BLOCK):
+                score(frames[i:i + WINDOWS_PER_BLOCK])
+            pending = pending[len(frames) * hop:]
+
+    if speech_samples == 0:
+        return silent_result()
+
+    if not f0s:
+        # less speech than one window: score it zero-padded
+        score(np.pad(pending, (0, window - len(pending)))[None])
+
+    voiced = np.concatenate(f0s) if f0s else f0s
+    f0 = float(np.median(voiced)) if len(voiced) else 0.0
+    return score_zones(scorer, zones_acc, total_acc, f0)
+
+
+def _score_one(path):
+    try:
+        return path, score_file(path)
+    except (OSError, ValueError) as e:
+        print(f"skipping: {e}", file=sys.stderr)
+        return path, None
+
+
+def score_files(paths, workers=None):
+    # Generator of (path, result); result is None for unreadable files.
+    # workers=1 scores in-process, otherwise a process pool.
+    paths = list(paths)
+
+    if workers == 1 or len(paths) < 2:
+        for path in paths:
+            yield _score_one(path)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(_score_one, paths, chunksize=16)
+
+
+def collect_paths(targets):
+    for target in targets:
+        if os.path.isdir(target):
+            for root, _, files in os.walk(target):
+                for name in sorted(files):
+                    if name.lower().endswith(AUDIO_EXTENSIONS):
+                        yield os.path.join(root, name)
+        else:
+            yield target
+
+
+# ----------------------------------------------------------
+# 🚀 CLI
+# ----------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-score stored drill recordings.")
+    parser.add_argument("targets", nargs="+", help="WAV/PCM files or directories")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: one per core, 1 = no pool)")
+    parser.add_argument("--out", default="-", help="CSV output path (default: stdout)")
+    args = parser.parse_args(argv)
+
+    out = sys.stdout if args.out == "-" else open(args.out, "w", newline="")
+    try:
+        writer = csv.DictWriter(out, fieldnames=RESULT_FIELDS)
+        writer.writeheader()
+        for path, res in score_files(collect_paths(args.targets), args.workers):
+            if res is not None:
+                writer.writerow({"path": path, **res})
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
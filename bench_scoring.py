@@ -0,0 +1,238 @@
+# ==========================================================
+# ⏱ SCORING BENCHMARKS
+# Hot-path timings on synthetic audio — no mic, GPU or network
+# ==========================================================
+#
+#   python bench_scoring.py --out bench.json
+#   python bench_scoring.py --baseline bench.json --threshold 0.15
+#
+# Paths:
+#   mic  — voice_engine.score_buffer on 2 / 3 / 5 s buffers
+#          (everything analyze_mic_input does after sd.rec)
+#   live — AlphaResonanceProcessor.recv (inline mode) on 480 / 960 /
+#          4096-sample frames
+#   band / band+pitch — one 4096-sample live window through the
+#          scorer alone vs. scorer + PitchTracker (the F0 cost per hop)
+#
+# Regression mode exits 1 when any case's p50 latency is more than
+# `threshold` slower than the baseline file.
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+import numpy as np
+
+import voice_engine
+from resonance_dsp import ResonanceScorer, get_pitch_tracker, LIVE_PROFILE
+
+
+MIC_RATE = 44100
+LIVE_RATE = 48000
+
+MIC_SECONDS = (2, 3, 5)
+LIVE_FRAMES = (480, 960, 4096)
+WINDOW = 4096
+WINDOW_COUNT = 200
+
+SIGNALS = ("stack", "noise", "silence")
+
+SEED = 1234
+
+
+# ----------------------------------------------------------
+# 🎼 SYNTHETIC FIXTURES
+# ----------------------------------------------------------
+def make_signal(kind, n_samples, sample_rate, seed=SEED):
+    # float32 mono in [-1, 1], identical on every run
+    t = np.arange(n_samples) / sample_rate
+
+    if kind == "stack":
+        sig = (0.40 * np.sin(2 * np.pi * 80 * t) +
+               0.30 * np.sin(2 * np.pi * 200 * t) +
+               0.10 * np.sin(2 * np.pi * 4000 * t))
+    elif kind == "noise":
+        sig = 0.2 * np.random.default_rng(seed).standard_normal(n_samples)
+    elif kind == "silence":
+        sig = np.zeros(n_samples)
+    else:
+        raise ValueError(f"unknown signal: {kind}")
+
+    return sig.astype(np.float32)
+
+
+class _SyntheticFrame:
+
+    # Quacks like av.AudioFrame for recv(): packed mono s16 samples
+
+    def __init__(self, samples, sample_rate=LIVE_RATE):
+        self._samples = samples.reshape(1, -1)
+        self.sample_rate = sample_rate
+        self.layout = SimpleNamespace(channels=("FL",))
+        self.format = SimpleNamespace(is_planar=False)
+
+    def to_ndarray(self):
+        return self._samples
+
+
+def _live_frames(kind, frame_size, seconds=2):
+    sig = make_signal(kind, seconds * LIVE_RATE, LIVE_RATE)
+    pcm = (sig * 32767).astype(np.int16)
+    n = len(pcm) // frame_size
+    return [_SyntheticFrame(pcm[i * frame_size:(i + 1) * frame_size]) for i in range(n)]
+
+
+# ----------------------------------------------------------
+# 📏 MEASUREMENT
+# ----------------------------------------------------------
+def _measure(fn, items, warmup=3):
+    for item in items[:warmup]:
+        fn(item)
+
+    latencies = np.empty(len(items))
+    start = time.perf_counter()
+    for i, item in enumerate(items):
+        t0 = time.perf_counter()
+        fn(item)
+        latencies[i] = time.perf_counter() - t0
+    elapsed = time.perf_counter() - start
+
+    # second pass for memory — tracemalloc would skew the timings
+    tracemalloc.start()
+    for item in items:
+        fn(item)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "frames": len(items),
+        "frames_per_s": round(len(items) / elapsed, 2),
+        "p50_us": round(float(np.percentile(latencies, 50)) * 1e6, 2),
+        "p99_us": round(float(np.percentile(latencies, 99)) * 1e6, 2),
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+def bench_mic(kind, seconds, repeat):
+    buf = make_signal(kind, seconds * MIC_RATE, MIC_RATE)
+    return _measure(voice_engine.score_buffer, [buf] * repeat, warmup=1)
+
+
+def bench_live(kind, frame_size):
+    from live_stream import AlphaResonanceProcessor
+
+    proc = AlphaResonanceProcessor(mode="inline")
+    return _measure(proc.recv, _live_frames(kind, frame_size))
+
+
+def bench_window(kind, with_pitch):
+    scorer = ResonanceScorer(LIVE_PROFILE, LIVE_RATE, WINDOW)
+    tracker = get_pitch_tracker(LIVE_RATE, WINDOW)
+
+    sig = make_signal(kind, WINDOW, LIVE_RATE) * np.hanning(WINDOW).astype(np.float32)
+
+    def band(frame):
+        scorer.zones(frame)
+
+    def band_pitch(frame):
+        scorer.zones(frame)
+        tracker.from_magnitude(scorer.magnitude()[0])
+
+    return _measure(band_pitch if with_pitch else band, [sig] * WINDOW_COUNT)
+
+
+def run_suite(repeat=20, paths=("mic", "live", "band", "band+pitch")):
+    results = []
+
+    for kind in SIGNALS:
+        if "mic" in paths:
+            for seconds in MIC_SECONDS:
+                results.append({"path": "mic", "signal": kind, "size": seconds * MIC_RATE,
+                                **bench_mic(kind, seconds, repeat)})
+
+        if "live" in paths:
+            for frame_size in LIVE_FRAMES:
+                results.append({"path": "live", "signal": kind, "size": frame_size,
+                                **bench_live(kind, frame_size)})
+
+        for path in ("band", "band+pitch"):
+            if path in paths:
+                results.append({"path": path, "signal": kind, "size": WINDOW,
+                                **bench_window(kind, path == "band+pitch")})
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "timestamp": time.time(),
+        },
+        "results": results,
+    }
+
+
+# ----------------------------------------------------------
+# 🚨 REGRESSION CHECK
+# ----------------------------------------------------------
+def _case_key(row):
+    return row["path"], row["signal"], row["size"]
+
+
+def compare(current, baseline, threshold):
+    # -> list of human-readable regressions (empty = pass)
+    old = {_case_key(r): r for r in baseline["results"]}
+    regressions = []
+
+    for row in current["results"]:
+        ref = old.get(_case_key(row))
+        if ref is None or ref["p50_us"] <= 0:
+            continue
+
+        ratio = row["p50_us"] / ref["p50_us"]
+        if ratio > 1 + threshold:
+            regressions.append(
+                f"{row['path']}/{row['signal']}/{row['size']}: "
+                f"p50 {ref['p50_us']}us -> {row['p50_us']}us (x{ratio:.2f})"
+            )
+
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the scoring hot paths.")
+    parser.add_argument("--out", default="-", help="JSON output path (default: stdout)")
+    parser.add_argument("--repeat", type=int, default=20, help="mic buffers per case")
+    parser.add_argument("--paths", default="mic,live,band,band+pitch",
+                        help="comma list: mic, live, band, band+pitch")
+    parser.add_argument("--baseline", help="previous JSON run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="allowed p50 slowdown vs baseline (0.15 = 15%%)")
+    args = parser.parse_args(argv)
+
+    report = run_suite(repeat=args.repeat, paths=tuple(args.paths.split(",")))
+    text = json.dumps(report, indent=2)
+
+    if args.out == "-":
+        print(text)
+    else:
+        with open(args.out, "w") as f:
+            f.write(text)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+        regressions = compare(report, baseline, args.threshold)
+        for line in regressions:
+            print("REGRESSION", line, file=sys.stderr)
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+# ==========================================================
+# 📚 ALPHA CONTENT STORE
+# words.json loaded once per process; drill corpora memory-mapped
+# ==========================================================
+#
+# Every page used to re-open and re-filter words.json on each rerun.
+# The store parses the files once, re-checks their mtime at most every
+# RELOAD_CHECK_INTERVAL seconds (edit the JSON, the app picks it up),
+# and keeps ready-made tuples by level and token count, so lookups are
+# O(1).
+#
+# Drill corpora are served as MappedCorpus: a text blob plus its uint32
+# offset index (corpus_builder format), both memory-mapped read-only.
+# sentences.txt (millions of lines) is mapped as is; word-list views
+# the pages walk are written once to CORPUS_DIR and mapped the same way.
+# Every session and server process shares one page-cache copy, and a
+# session only keeps an integer cursor into it.
+
+import hashlib
+import json
+import mmap
+import os
+import threading
+import time
+
+import numpy as np
+
+from corpus_builder import ensure_index, write_lines
+from instrumentation import METRICS, clock, observe
+
+
+WORDS_PATHS = ("words.json", "Alpha_Male_Deep_Voice/words.json")
+SENTENCES_PATHS = ("sentences.txt", "Alpha_Male_Deep_Voice/sentences.txt")
+
+RELOAD_CHECK_INTERVAL = 1.0
+
+# materialized word-list corpora (one .txt + .idx per view and words.json)
+CORPUS_DIR = ".corpus"
+
+
+def _first_existing(paths):
+    for p in paths:
+        if os.path.exists(p):
+            return p
+    return None
+
+
+def _stamp(path):
+    if path is None:
+        return None
+    st = os.stat(path)
+    return path, st.st_mtime_ns, st.st_size
+
+
+# ----------------------------------------------------------
+# 🗺 MEMORY-MAPPED CORPUS
+# ----------------------------------------------------------
+class MappedCorpus:
+
+    # Read-only sequence: len(), corpus[n], iteration. A lookup is two
+    # offset reads and one slice of the mapped text — O(1), no copies
+    # of anything but the returned string.
+
+    def __init__(self, text_path):
+        self.path = text_path
+        self.offsets = np.memmap(ensure_index(text_path), dtype="<u4", mode="r")
+
+        with open(text_path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            # an empty file cannot be mapped (and has no lines anyway)
+            self._text = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, n):
+        total = len(self)
+        if n < 0:
+            n += total
+        if not 0 <= n < total:
+            raise IndexError(n)
+        start, end = self.offsets[n:n + 2]
+        return self._text[int(start):int(end)].decode("utf-8").rstrip("\r\n")
+
+
+# ----------------------------------------------------------
+# 🧊 IMMUTABLE SNAPSHOT
+# ----------------------------------------------------------
+class _Snapshot:
+
+    def __init__(self, data, sentences=(), stamps=None):
+        by_level = {}
+        by_tokens = {}
+
+        # JSON category order is kept everywhere — pages rely on it
+        for level, items in data.items():
+            items = [str(s) for s in items]
+            by_level[level] = tuple(items)
+
+            for s in items:
+                by_tokens.setdefault(len(s.split()), []).append(s)
+
+        self.by_level = by_level
+        self.by_tokens = {k: tuple(v) for k, v in by_tokens.items()}
+        self.sentences = sentences
+        self.stamps = stamps
+        self.views = {}
+
+
+# ----------------------------------------------------------
+# 🗄 STORE
+# ----------------------------------------------------------
+class ContentStore:
+
+    def __init__(self, words_paths=WORDS_PATHS, sentences_paths=SENTENCES_PATHS):
+        self.words_paths = words_paths
+        self.sentences_paths = sentences_paths
+
+        self._lock = threading.Lock()
+        self._snap = None
+        self._stamps = None
+        self._checked = 0.0
+
+    def _load(self, words_path, sentences_path, stamps):
+        t0 = clock() if METRICS else 0.0
+
+        data = {}
+        if words_path:
+            with open(words_path, "r") as f:
+                data = json.load(f)
+
+        sentences = MappedCorpus(sentences_path) if sentences_path else ()
+
+        snap = _Snapshot(data, sentences, stamps)
+        if METRICS:
+            observe("content_load_seconds", clock() - t0)
+        return snap
+
+    def snapshot(self):
+        now = time.monotonic()
+        if self._snap is not None and now - self._checked < RELOAD_CHECK_INTERVAL:
+            return self._snap
+
+        with self._lock:
+            if self._snap is None or now - self._checked >= RELOAD_CHECK_INTERVAL:
+                words_path = _first_existing(self.words_paths)
+                sentences_path = _first_existing(self.sentences_paths)
+                stamps = (_stamp(words_path), _stamp(sentences_path))
+
+                if stamps != self._stamps:
+                    self._snap = self._load(words_path, sentences_path, stamps)
+                    self._stamps = stamps
+
+                self._checked = now
+
+        return self._snap
+
+    # ------------------------------------------------------
+    # 🔎 LOOKUPS (all return tuples)
+    # ------------------------------------------------------
+    def level(self, name):
+        return self.snapshot().by_level.get(name, ())
+
+    def with_tokens(self, n):
+        return self.snapshot().by_tokens.get(n, ())
+
+    # ------------------------------------------------------
+    # 📜 MAPPED CORPORA (shared, index with an int cursor)
+    # ------------------------------------------------------
+    def sentence_corpus(self):
+        # sentences.txt as a MappedCorpus (empty tuple when missing)
+        return self.snapshot().sentences
+
+    def level_corpus(self, names):
+        # the named levels, in order, as a MappedCorpus — materialized
+        # once per words.json version and shared by every process
+        names = tuple(names)
+        snap = self.snapshot()
+        key = ("corpus", names)
+        corpus = snap.views.get(key)
+        if corpus is None:
+            corpus = snap.views[key] = self._materialize(snap, names)
+        return corpus
+
+    def _materialize(self, snap, names):
+        digest = hashlib.sha1(repr((snap.stamps[0], names)).encode("utf-8")).hexdigest()[:16]
+        path = os.path.join(CORPUS_DIR, f"levels-{digest}.txt")
+
+        if not os.path.exists(path):
+            os.makedirs(CORPUS_DIR, exist_ok=True)
+            write_lines((s.replace("\n", " ").encode("utf-8") + b"\n"
+                         for n in names for s in snap.by_level.get(n, ())), path)
+        return MappedCorpus(path)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    # One store per server process, shared by every Streamlit session
+    global _store
+
+    with _store_lock:
+        if _store is None:
+            _store = ContentStore()
+        return _store
@@ -0,0 +1,361 @@
+# ==========================================================
+# 🏗 DRILL CORPUS BUILDER
+# Seeded, streaming sentence generator + companion offset index
+# ==========================================================
+#
+#   python corpus_builder.py                          # 1,000 sentences
+#   python corpus_builder.py --count 2000000 --seed 7
+#
+# Capacity is max_count() (≈ 4.6M sentences: half the grammar plus the
+# classics); larger counts are refused before anything is written.
+#
+# Writes sentences.txt (one sentence per line) and sentences.idx: the
+# byte offset of every line as little-endian uint32, plus one final
+# offset = file size, so sentence N is text[idx[N]:idx[N + 1]].
+#
+# Sentences are assembled from fragment slots (opener, subject, verb,
+# object, closer, suffix) per drill style. Draws are deduplicated on
+# their combination number with a bitmap over the whole grammar, so
+# memory is bounded by the grammar size (≈ 1.2 MB), never by --count,
+# and nothing is held in a list: lines go straight to disk.
+#
+# Readers never load the file: content_store memory-maps both files
+# (MappedCorpus); read_sentence() here does one seek into the index and
+# one into the text.
+
+import argparse
+import os
+import random
+import struct
+import sys
+from array import array
+
+import numpy as np
+
+
+SENTENCES_FILE = "sentences.txt"
+INDEX_SUFFIX = ".idx"
+
+DEFAULT_COUNT = 1000
+DEFAULT_SEED = 0
+
+# index entries buffered before each write
+INDEX_FLUSH = 65536
+
+
+# ----------------------------------------------------------
+# 🧩 GRAMMAR
+# ----------------------------------------------------------
+# The hand-written originals are always emitted first
+CLASSICS = {
+    "arjun_das": [
+        "The ground beneath me vibrates with my voice.",
+        "Deep shadows move in the silence of the night.",
+        "A heavy stone rolls slowly across the floor.",
+        "The thunder rumbles in the distance, low and steady.",
+        "My command is absolute, quiet, and profound."
+    ],
+    "neutral_accent": [
+        "Stability is the mark of a true leader.",
+        "I maintain a flat and consistent tone.",
+        "There is no urgency in the way I speak.",
+        "Every word carries the same weight and power.",
+        "I am calm, composed, and entirely neutral."
+    ],
+    "chest_involvement": [
+        "I push the sound from the center of my chest.",
+        "Resonance builds within my ribcage now.",
+        "The diaphragm is the engine of my authority.",
+        "My voice is a physical force in this room.",
+        "I feel the buzz in my sternum as I speak."
+    ]
+}
+
+OPENERS = [
+    "", "Slowly,", "Right now,", "Without effort,", "In the silence,",
+    "With intent,", "Once again,", "Every time,", "From here on,",
+    "Tonight,", "Calmly,", "At last,", "Deliberately,", "Even now,",
+    "In this moment,", "Step by step,", "Quietly,", "For now,",
+    "Here,", "In the dark,", "With patience,", "Without a doubt,",
+    "Once more,", "By design,",
+]
+
+SUBJECTS = [
+    "my voice", "the sound", "each word", "my command", "this tone",
+    "the resonance", "my breath", "the low note", "my presence",
+    "the vibration", "every syllable", "the rumble", "my tone",
+    "the bass", "each phrase", "my low voice", "the depth",
+    "this sound", "the chest voice", "every pause",
+]
+
+STYLES = {
+    "arjun_das": {
+        "verbs": [
+            "rolls across", "settles into", "sinks beneath", "drifts through",
+            "rumbles under", "moves through", "echoes across", "rests on",
+            "spreads over", "falls into",
+        ],
+        "objects": [
+            "the floor", "the dark room", "the night", "the old stone",
+            "the distance", "the deep shadows", "the empty hall",
+            "the still air", "the ground", "the quiet street",
+        ],
+    },
+    "neutral_accent": {
+        "verbs": [
+            "holds", "steadies", "carries", "measures", "keeps",
+            "owns", "levels", "anchors", "commands", "balances",
+        ],
+        "objects": [
+            "the conversation", "the whole table", "the pause",
+            "the meeting", "the next sentence", "the silence",
+            "the question", "the answer", "the room", "the moment",
+        ],
+    },
+    "chest_involvement": {
+        "verbs": [
+            "starts in", "builds within", "pushes from", "buzzes in",
+            "grows inside", "rises from", "resonates through", "lives in",
+            "expands across", "vibrates in",
+        ],
+        "objects": [
+            "my chest", "my ribcage", "my sternum", "the diaphragm",
+            "my upper back", "my whole torso", "the center of my chest",
+            "my collarbones", "my lungs", "my core",
+        ],
+    },
+}
+
+CLOSERS = [
+    "", "low and steady", "without hurry", "like distant thunder",
+    "calm and certain", "heavy and slow", "with quiet authority",
+    "deep and even", "without strain", "firm and unhurried",
+    "slow and grounded", "with full weight", "without rushing",
+    "steady as stone", "low and certain", "in one long breath",
+]
+
+SUFFIXES = [".", "...", " today.", " now."]
+
+
+def _style_sizes():
+    # combinations per style, in STYLES order
+    shared = len(OPENERS) * len(SUBJECTS) * len(CLOSERS) * len(SUFFIXES)
+    return [shared * len(s["verbs"]) * len(s["objects"]) for s in STYLES.values()]
+
+
+def grammar_size():
+    return sum(_style_sizes())
+
+
+def max_count():
+    # rejection sampling stays cheap while at most half the space is used
+    return sum(len(v) for v in CLASSICS.values()) + grammar_size() // 2
+
+
+def compose(k):
+    # combination number k in [0, grammar_size()) -> sentence
+    for style, size in zip(STYLES.values(), _style_sizes()):
+        if k < size:
+            break
+        k -= size
+
+    k, suffix = divmod(k, len(SUFFIXES))
+    k, closer = divmod(k, len(CLOSERS))
+    k, obj = divmod(k, len(style["objects"]))
+    k, verb = divmod(k, len(style["verbs"]))
+    opener, subject = divmod(k, len(SUBJECTS))
+
+    subject = SUBJECTS[subject]
+    head = f"{OPENERS[opener]} {subject}" if OPENERS[opener] else subject[:1].upper() + subject[1:]
+
+    text = f"{head} {style['verbs'][verb]} {style['objects'][obj]}"
+    if CLOSERS[closer]:
+        text += f", {CLOSERS[closer]}"
+    return text + SUFFIXES[suffix]
+
+
+def check_count(count):
+    if count > max_count():
+        raise ValueError(f"count {count:,} exceeds the grammar's capacity ({max_count():,})")
+
+
+def iter_sentences(count, seed=DEFAULT_SEED):
+    # Seeded stream of `count` unique sentences — same seed, same corpus
+    check_count(count)
+    return _sentences(count, seed)
+
+
+def _sentences(count, seed):
+    emitted = 0
+    for lines in CLASSICS.values():
+        for line in lines:
+            if emitted == count:
+                return
+            yield line
+            emitted += 1
+
+    rng = random.Random(seed)
+    n = grammar_size()
+    seen = np.zeros((n + 7) // 8, dtype=np.uint8)
+
+    while emitted < count:
+        k = rng.randrange(n)
+        byte, bit = k >> 3, 1 << (k & 7)
+        if seen[byte] & bit:
+            continue
+        seen[byte] |= bit
+        yield compose(k)
+        emitted += 1
+
+
+# ----------------------------------------------------------
+# 💽 WRITING
+# ----------------------------------------------------------
+def index_path(text_path):
+    return os.path.splitext(text_path)[0] + INDEX_SUFFIX
+
+
+def _write_offsets(lengths, idx):
+    # byte length of every line -> their offsets (+ the final one) in idx
+    offsets = array("I")
+    pos = 0
+    count = 0
+    for n in lengths:
+        offsets.append(pos)
+        pos += n
+        count += 1
+        if pos > 0xFFFFFFFF:
+            raise ValueError("corpus exceeds 4 GiB — uint32 offsets cannot address it")
+        if len(offsets) == INDEX_FLUSH:
+            idx.write(_le(offsets))
+            del offsets[:]
+    offsets.append(pos)
+    idx.write(_le(offsets))
+    return count
+
+
+def _discard(*paths):
+    for p in paths:
+        if os.path.exists(p):
+            os.remove(p)
+
+
+def write_lines(lines, text_path):
+    # Streams encoded lines to text_path and their offsets to the index;
+    # both go to temp files first so readers never see half a corpus.
+    idx_path = index_path(text_path)
+    tmp_text, tmp_idx = (f"{p}.{os.getpid()}.tmp" for p in (text_path, idx_path))
+
+    def written(text):
+        for line in lines:
+            text.write(line)
+            yield len(line)
+        # text hits the disk first, so the index is never older than it
+        text.flush()
+
+    try:
+        with open(tmp_text, "wb") as text, open(tmp_idx, "wb") as idx:
+            count = _write_offsets(written(text), idx)
+    except BaseException:
+        _discard(tmp_text, tmp_idx)
+        raise
+
+    os.replace(tmp_text, text_path)
+    os.replace(tmp_idx, idx_path)
+    return count
+
+
+def _le(offsets):
+    if sys.byteorder != "little":
+        offsets = array("I", offsets)
+        offsets.byteswap()
+    return offsets.tobytes()
+
+
+def build_corpus(count=DEFAULT_COUNT, seed=DEFAULT_SEED, text_path=SENTENCES_FILE):
+    lines = (s.encode("utf-8") + b"\n" for s in iter_sentences(count, seed))
+    return write_lines(lines, text_path)
+
+
+def write_index(text_path):
+    # (Re)index an existing, possibly hand-edited, sentences file. Only
+    # the .idx is written — the text (and its mtime) stays untouched; a
+    # last line without a newline simply ends at the file size.
+    idx_path = index_path(text_path)
+    tmp_idx = f"{idx_path}.{os.getpid()}.tmp"
+
+    try:
+        with open(text_path, "rb") as text, open(tmp_idx, "wb") as idx:
+            count = _write_offsets((len(line) for line in text), idx)
+    except BaseException:
+        _discard(tmp_idx)
+        raise
+
+    os.replace(tmp_idx, idx_path)
+    return count
+
+
+# ----------------------------------------------------------
+# 🔎 RANDOM ACCESS
+# ----------------------------------------------------------
+def ensure_index(text_path):
+    # -> index path, rebuilt when missing or older than the text
+    idx_path = index_path(text_path)
+    if not os.path.exists(idx_path) or os.path.getmtime(idx_path) < os.path.getmtime(text_path):
+        write_index(text_path)
+    return idx_path
+
+
+def sentence_count(text_path=SENTENCES_FILE):
+    return os.path.getsize(ensure_index(text_path)) // 4 - 1
+
+
+def read_sentence(n, text_path=SENTENCES_FILE):
+    if n < 0:
+        raise IndexError(n)
+    with open(ensure_index(text_path), "rb") as idx:
+        idx.seek(4 * n)
+        raw = idx.read(8)
+    if len(raw) < 8:
+        raise IndexError(n)
+    start, end = struct.unpack("<2I", raw)
+
+    with open(text_path, "rb") as text:
+        text.seek(start)
+        return text.read(end - start).decode("utf-8").rstrip("\r\n")
+
+
+def random_sentence(text_path=SENTENCES_FILE, rng=random):
+    return read_sentence(rng.randrange(sentence_count(text_path)), text_path)
+
+
+# ----------------------------------------------------------
+# 🚀 CLI
+# ----------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the drill sentence corpus.")
+    parser.add_argument("--count", type=int, default=DEFAULT_COUNT,
+                        help=f"sentences to generate (default: {DEFAULT_COUNT:,}, "
+                             f"at most {max_count():,})")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="RNG seed")
+    parser.add_argument("--out", default=SENTENCES_FILE,
+                        help="text output; the index goes next to it as .idx")
+    parser.add_argument("--reindex", action="store_true",
+                        help="only rebuild the index of an existing --out file")
+    args = parser.parse_args(argv)
+
+    if not args.reindex:
+        try:
+            check_count(args.count)
+        except ValueError as e:
+            parser.error(str(e))
+
+    if args.reindex:
+        n = write_index(args.out)
+    else:
+        n = build_corpus(args.count, args.seed, args.out)
+    print(f"{n:,} sentences -> {args.out} (+ {index_path(args.out)})")
+
+
+if __name__ == "__main__":
+    main()
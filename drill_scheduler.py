@@ -0,0 +1,183 @@
+# ==========================================================
+# 🧠 ADAPTIVE DRILL SCHEDULER
+# Weakness-driven spaced repetition over a drill corpus
+# ==========================================================
+#
+# Items are integer positions in a corpus (content_store.MappedCorpus or
+# any sequence). After each scored attempt an item gets:
+#
+#   deficit  EMA of how far chest / belly / gravel / sub100 fell short
+#            of the target (0 = all met, 1 = all zero)
+#   streak   consecutive passes
+#   due      last_seen + BASE_INTERVAL * GROWTH ** streak * (1 - deficit)
+#
+# so weak items come back within a minute and mastered ones drift out
+# exponentially. Per (user, deck) the scheduler keeps a min-heap on due
+# time over the items seen so far, with lazy invalidation:
+#
+#   record()     O(log n) — heap push + one UPSERT into progress.db
+#   next_item()  amortized O(log n) — overdue item first, else the next
+#                unseen corpus item, else whatever is due soonest; one
+#                in NEW_ITEM_EVERY picks is new even while reviews are
+#                due, so a struggling member still moves forward
+#
+# Unseen items are never materialized, so a corpus of millions costs
+# nothing until it is practised. State lives in the progress store's
+# drill_state table and is reloaded (O(seen)) when a process starts.
+#
+# `user` is the progress store's user (DEFAULT_USER until accounts
+# exist), so schedules and attempts describe the same member; every
+# session of that member shares one scheduler, serialized by its lock.
+
+import heapq
+import threading
+import time
+
+from progress_store import DEFAULT_USER, get_progress_store
+
+
+SCHEDULER_METRICS = ("chest", "belly", "gravel", "sub100")
+TARGET_SCORE = 85
+
+BASE_INTERVAL = 60.0       # seconds until a first pass comes back
+MIN_INTERVAL = 15.0        # a fully failed item still waits this long
+GROWTH = 4.0               # interval multiplier per consecutive pass
+
+DEFICIT_SMOOTHING = 0.5    # weight of the newest attempt in the EMA
+
+NEW_ITEM_EVERY = 4
+
+
+def score_deficit(scores, target=TARGET_SCORE):
+    # mean shortfall over SCHEDULER_METRICS, 0..1
+    return sum(max(0.0, target - scores.get(m, 0)) for m in SCHEDULER_METRICS) / (
+        target * len(SCHEDULER_METRICS))
+
+
+def review_interval(deficit, streak):
+    return max(MIN_INTERVAL, BASE_INTERVAL * GROWTH ** streak * (1.0 - deficit))
+
+
+class DrillScheduler:
+
+    def __init__(self, corpus, deck, user=DEFAULT_USER, store=None):
+        self.corpus = corpus
+        self.deck = deck
+        self.user = user
+        self.store = store or get_progress_store()
+
+        self._lock = threading.Lock()
+        self._state = {}     # item -> (deficit, streak, last_seen, due)
+        self._heap = []      # (due, item); stale when due != state due
+        self._next_new = 0
+        self._reviews = 0    # review attempts since the last new item
+
+        self._load()
+
+    def _load(self):
+        n = len(self.corpus)
+        for item, word, deficit, streak, last_seen, due in self.store.drill_states(self.deck, self.user):
+            # the corpus was rebuilt under this item: its history is moot
+            if item >= n or self.corpus[item] != word:
+                continue
+            self._state[item] = (deficit, streak, last_seen, due)
+            self._heap.append((due, item))
+        heapq.heapify(self._heap)
+
+    def __len__(self):
+        # items practised at least once
+        return len(self._state)
+
+    # ------------------------------------------------------
+    # 🎯 SELECTION
+    # ------------------------------------------------------
+    def _peek(self):
+        # earliest valid heap entry, dropping stale ones on the way
+        heap = self._heap
+        while heap:
+            due, item = heap[0]
+            state = self._state.get(item)
+            if state is not None and state[3] == due:
+                return due, item
+            heapq.heappop(heap)
+        return None
+
+    def _unseen(self):
+        n = len(self.corpus)
+        while self._next_new < n and self._next_new in self._state:
+            self._next_new += 1
+        return self._next_new if self._next_new < n else None
+
+    def next_item(self, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            top = self._peek()
+            overdue = top is not None and top[0] <= now
+            if overdue and self._reviews < NEW_ITEM_EVERY - 1:
+                return top[1]
+
+            new = self._unseen()
+            if new is not None:
+                return new
+
+            # everything seen, nothing due yet: the soonest one
+            return top[1] if top is not None else 0
+
+    # ------------------------------------------------------
+    # 📝 UPDATES
+    # ------------------------------------------------------
+    def record(self, item, scores, passed, now=None):
+        # scores: the attempt's score dict; passed: the caller's verdict
+        now = time.time() if now is None else now
+        deficit = score_deficit(scores)
+
+        with self._lock:
+            prev = self._state.get(item)
+            self._reviews = 0 if prev is None else self._reviews + 1
+            if prev is not None:
+                deficit = (1 - DEFICIT_SMOOTHING) * prev[0] + DEFICIT_SMOOTHING * deficit
+                streak = prev[1] + 1 if passed else 0
+            else:
+                streak = 1 if passed else 0
+
+            due = now + review_interval(deficit, streak)
+            self._state[item] = (deficit, streak, now, due)
+            heapq.heappush(self._heap, (due, item))
+
+            # stale entries pile up under repeated items — rebuild now and then
+            if len(self._heap) > 2 * len(self._state) + 64:
+                self._heap = [(s[3], i) for i, s in self._state.items()]
+                heapq.heapify(self._heap)
+
+            # under the lock: sessions sharing this scheduler persist in
+            # the order they updated memory
+            self.store.save_drill_state(self.deck, item, self.corpus[item], deficit, streak,
+                                        now, due, user=self.user)
+        return due
+
+
+# ----------------------------------------------------------
+# 🗂 ONE SCHEDULER PER (USER, DECK) PER PROCESS
+# ----------------------------------------------------------
+_schedulers = {}
+_schedulers_lock = threading.Lock()
+
+
+def _corpus_key(corpus):
+    # MappedCorpus objects live as long as their content_store snapshot,
+    # so identity tracks reloads; plain lists (the pages' fallbacks) are
+    # rebuilt on every rerun and compare by value
+    if isinstance(corpus, (list, tuple)):
+        return tuple(corpus)
+    return id(corpus)
+
+
+def get_scheduler(corpus, deck, user=DEFAULT_USER):
+    # Shared by every session of the user; rebuilt when the corpus
+    # changes (content_store reloaded the files)
+    key = (user, deck)
+    with _schedulers_lock:
+        sched = _schedulers.get(key)
+        if sched is None or _corpus_key(sched.corpus) != _corpus_key(corpus):
+            sched = _schedulers[key] = DrillScheduler(corpus, deck, user)
+        return sched
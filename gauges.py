@@ -0,0 +1,145 @@
+# ==========================================================
+# 🎯 GAUGE FACTORY
+# Memoized Plotly indicator gauges for Voice Lab + Alpha Drills
+# ==========================================================
+#
+# Building a go.Figure(go.Indicator) costs ~5 ms; pages used to build
+# 3–5 of them on every rerun even when the scores had not changed.
+# Gauges are now built once per (label, value, color, theme) and kept
+# in a bounded LRU shared by every session. Cached figures are treated
+# as read-only — never mutate what gauge_figure() returns.
+#
+# Lite mode swaps the figure for a ~600-byte inline SVG: only the
+# numbers change between reruns, and no plotly.js payload goes out
+# per gauge — much kinder to phones on mobile data.
+
+import math
+import os
+from functools import lru_cache
+
+import streamlit as st
+
+from instrumentation import METRICS, clock, observe
+
+
+# 5 labels x 101 values x 2 themes fits comfortably
+GAUGE_CACHE_SIZE = 1024
+
+# Lite mode: inline SVG (~1 KB, no plotly.js) instead of Plotly figures.
+# Server default from the env; members can flip it per session with
+# the sidebar toggle (session key "light_gauges").
+LIGHT_GAUGES = os.getenv("ALPHA_LIGHT_GAUGES", "0") == "1"
+
+THEMES = {
+    # 0_Voice_Lab.create_gauge
+    "lab": {
+        "title_font": {'color': 'white', 'size': 16},
+        "gauge": {'axis': {'range': [0, 100]}},
+        "height": 200,
+        "margin": dict(l=10, r=10, t=40, b=10),
+    },
+    # 1_Alpha_Drills.create_meter (85% pass line)
+    "drill": {
+        "title_font": {'size': 18, 'color': '#111'},
+        "gauge": {
+            'axis': {'range': [0, 100], 'tickwidth': 1},
+            'bgcolor': "rgba(255,255,255,0.05)",
+            'threshold': {'line': {'color': "white", 'width': 4}, 'value': 85}
+        },
+        "height": 220,
+        "margin": dict(l=20, r=20, t=50, b=20),
+    },
+}
+
+
+@lru_cache(maxsize=GAUGE_CACHE_SIZE)
+def _build_gauge(label, value, color, theme):
+    # plotly is imported on the first figure — lite mode never needs it
+    import plotly.graph_objects as go
+
+    t0 = clock() if METRICS else 0.0
+    t = THEMES[theme]
+
+    fig = go.Figure(go.Indicator(
+        mode="gauge+number",
+        value=value,
+        title={'text': label, 'font': t["title_font"]},
+        gauge={**t["gauge"], 'bar': {'color': color}}
+    ))
+    fig.update_layout(paper_bgcolor='rgba(0,0,0,0)', font={'color': "white"},
+                      height=t["height"], margin=t["margin"])
+
+    if METRICS:
+        observe("gauge_build_seconds", clock() - t0, theme=theme)
+    return fig
+
+
+def gauge_figure(label, value, color, theme="drill"):
+    # scores are whole percentages — keep the key space small
+    return _build_gauge(label, int(value), color, theme)
+
+
+# ----------------------------------------------------------
+# 📶 LITE SVG GAUGE
+# ----------------------------------------------------------
+# Semicircle centred at (100, 110), radius 80. pathLength=100 lets the
+# value arc be drawn straight from the percentage.
+_ARC = "M 20 110 A 80 80 0 0 1 180 110"
+
+
+def _arc_point(pct, radius):
+    angle = math.pi * (1 - pct / 100)
+    return 100 + radius * math.cos(angle), 110 - radius * math.sin(angle)
+
+
+@lru_cache(maxsize=GAUGE_CACHE_SIZE)
+def gauge_svg(label, value, color, theme="drill"):
+    t = THEMES[theme]
+    value = max(0, min(100, int(value)))
+
+    marker = ""
+    threshold = t["gauge"].get("threshold")
+    if threshold:
+        x1, y1 = _arc_point(threshold["value"], 66)
+        x2, y2 = _arc_point(threshold["value"], 94)
+        marker = (f'<line x1="{x1:.1f}" y1="{y1:.1f}" x2="{x2:.1f}" y2="{y2:.1f}" '
+                  f'stroke="{threshold["line"]["color"]}" stroke-width="{threshold["line"]["width"]}"/>')
+
+    return (
+        f'<div style="height:{t["height"]}px;text-align:center;">'
+        f'<div style="color:{t["title_font"]["color"]};font-size:{t["title_font"]["size"]}px;">{label}</div>'
+        f'<svg viewBox="0 0 200 125" style="height:{t["height"] - 40}px;max-width:100%;">'
+        f'<path d="{_ARC}" pathLength="100" fill="none" stroke="rgba(255,255,255,0.12)" stroke-width="18"/>'
+        f'<path d="{_ARC}" pathLength="100" fill="none" stroke="{color}" stroke-width="18" '
+        f'stroke-dasharray="{value} 100"/>'
+        f'{marker}'
+        f'<text x="100" y="105" text-anchor="middle" font-size="34" fill="white">{value}</text>'
+        f'</svg></div>'
+    )
+
+
+def light_gauges_enabled():
+    return st.session_state.get("light_gauges", LIGHT_GAUGES)
+
+
+def light_gauge_toggle():
+    # sidebar switch shared by every page that shows gauges
+    st.sidebar.toggle("📶 Lite gauges (mobile data)", value=LIGHT_GAUGES, key="light_gauges")
+
+
+def make_gauge(label, value, color, theme="drill"):
+    # -> SVG markup in lite mode, otherwise a cached Plotly figure
+    if light_gauges_enabled():
+        return gauge_svg(label, value, color, theme)
+    return gauge_figure(label, value, color, theme)
+
+
+def render_gauge(gauge):
+    if isinstance(gauge, str):
+        st.markdown(gauge, unsafe_allow_html=True)
+    else:
+        st.plotly_chart(gauge, use_container_width=True)
+
+
+def gauge_cache_info():
+    return _build_gauge.cache_info()
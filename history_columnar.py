@@ -0,0 +1,229 @@
+# ==========================================================
+# 🧱 COLUMNAR TRAINING HISTORY
+# Parquet datasets partitioned by month (pyarrow, optional)
+# ==========================================================
+#
+#   python history_columnar.py convert      # progress.db/.json + CSV
+#
+# Datasets live under HISTORY_ROOT/<name>/month=YYYY-MM/*.parquet with
+# compact dtypes (uint8 whole-number scores, dictionary-encoded text,
+# float32 measurements, ms timestamps); fractional scores are kept as is.
+# load_columns() reads only the columns a page asks for, e.g. just
+# Alpha_Score for the certificate. Without pyarrow every helper
+# reports "unavailable" and callers keep their JSON/CSV path.
+#
+# A dataset converted from progress.db remembers the attempts row count
+# and MAX(id) it saw (_source.json, which pyarrow skips); load_columns()
+# compares those with the live table, since WAL inserts leave the .db
+# file's mtime untouched.
+
+import argparse
+import json
+import os
+import sqlite3
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    HAVE_ARROW = True
+except ImportError:
+    HAVE_ARROW = False
+
+
+HISTORY_ROOT = "history"
+
+PROGRESS_DATASET = "progress"            # drill attempts (progress store)
+ALPHA_PROGRESS_DATASET = "alpha_progress"  # home sessions (alpha_progress.csv)
+
+SCORE_COLUMNS = ("sub100", "chest", "gravel", "belly", "alpha")
+
+# Timestamp-like columns tried (in order) when partitioning a CSV
+_TIME_COLUMNS = ("timestamp", "Timestamp", "Date", "date", "Time", "time")
+
+# Row count / MAX(id) of the SQLite table a dataset was converted from
+_SOURCE_STAMP = "_source.json"
+
+
+def dataset_path(name, root=HISTORY_ROOT):
+    return os.path.join(root, name)
+
+
+def available(name, root=HISTORY_ROOT):
+    return HAVE_ARROW and os.path.isdir(dataset_path(name, root))
+
+
+# ----------------------------------------------------------
+# ✍️ WRITING
+# ----------------------------------------------------------
+def _compact(df):
+    # smallest sensible dtype per column
+    for col in df.columns:
+        if col in ("month", "timestamp"):
+            continue
+        if col in SCORE_COLUMNS or col == "Alpha_Score":
+            # uint8 only when every score is a whole 0..255; fractional
+            # ones (e.g. hand-kept CSV averages) keep their exact float64
+            # value — float32 would print 91.6 as 91.5999984741211
+            values = pd.to_numeric(df[col], errors="coerce")
+            known = values.dropna()
+            if ((known % 1 == 0) & known.between(0, 255)).all():
+                df[col] = values.astype("UInt8")
+            else:
+                df[col] = values.astype("float64")
+        elif pd.api.types.is_integer_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col], downcast="integer")
+        elif pd.api.types.is_float_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col], downcast="float")
+        else:
+            df[col] = df[col].astype("string").astype("category")
+    return df
+
+
+def write_dataset(df, name, root=HISTORY_ROOT):
+    # Replaces every month partition present in df; others are kept
+    if not HAVE_ARROW:
+        raise RuntimeError("pyarrow is not installed")
+
+    df = _compact(df.copy())
+    table = pa.Table.from_pandas(df, preserve_index=False)
+
+    ds.write_dataset(
+        table,
+        dataset_path(name, root),
+        format="parquet",
+        partitioning=ds.partitioning(pa.schema([("month", pa.string())]), flavor="hive"),
+        existing_data_behavior="delete_matching",
+    )
+    return len(df)
+
+
+def _with_month(df, ts_col):
+    ts = pd.to_datetime(df[ts_col], unit="s" if pd.api.types.is_numeric_dtype(df[ts_col]) else None,
+                        errors="coerce", utc=True)
+    df["timestamp"] = ts.dt.tz_localize(None).astype("datetime64[ms]")
+    df["month"] = ts.dt.strftime("%Y-%m").fillna("unknown")
+    if ts_col != "timestamp":
+        df = df.drop(columns=[ts_col])
+    return df
+
+
+def _write_stamp(name, root, stamp):
+    path = os.path.join(dataset_path(name, root), _SOURCE_STAMP)
+    if stamp is None:
+        if os.path.exists(path):
+            os.remove(path)
+        return
+    with open(path, "w") as f:
+        json.dump(stamp, f)
+
+
+def _table_stamp(conn):
+    count, max_id = conn.execute("SELECT COUNT(*), MAX(id) FROM attempts").fetchone()
+    return {"count": count, "max_id": max_id}
+
+
+def convert_progress_db(db_path="progress.db", root=HISTORY_ROOT):
+    # one query, so the stamp describes exactly the rows written
+    with sqlite3.connect(db_path) as conn:
+        df = pd.read_sql_query(
+            "SELECT id, user, word, ts, sub100, chest, gravel, belly, alpha, passed FROM attempts", conn
+        )
+    stamp = {"count": len(df), "max_id": int(df["id"].max()) if len(df) else None}
+
+    n = write_dataset(_with_month(df.drop(columns=["id"]), "ts"), PROGRESS_DATASET, root)
+    _write_stamp(PROGRESS_DATASET, root, stamp)
+    return n
+
+
+def convert_progress_json(json_path="progress.json", root=HISTORY_ROOT):
+    df = pd.read_json(json_path, convert_dates=False)
+    keep = [c for c in ("user", "word", "timestamp", *SCORE_COLUMNS) if c in df.columns]
+    n = write_dataset(_with_month(df[keep], "timestamp"), PROGRESS_DATASET, root)
+    _write_stamp(PROGRESS_DATASET, root, None)
+    return n
+
+
+def convert_csv(csv_path="alpha_progress.csv", name=ALPHA_PROGRESS_DATASET, root=HISTORY_ROOT):
+    df = pd.read_csv(csv_path)
+
+    ts_col = next((c for c in _TIME_COLUMNS if c in df.columns), None)
+    if ts_col is None:
+        df["month"] = "unknown"
+    else:
+        df = _with_month(df, ts_col)
+
+    return write_dataset(df, name, root)
+
+
+# ----------------------------------------------------------
+# 📖 READING
+# ----------------------------------------------------------
+def _newest_mtime(path):
+    newest = 0.0
+    for dirpath, _, files in os.walk(path):
+        for f in files:
+            newest = max(newest, os.path.getmtime(os.path.join(dirpath, f)))
+    return newest
+
+
+def _stale(path, source):
+    # the dataset is behind `source` (a text file or progress.db)
+    stamp_path = os.path.join(path, _SOURCE_STAMP)
+    if os.path.exists(stamp_path):
+        try:
+            with open(stamp_path) as f:
+                stamp = json.load(f)
+            with sqlite3.connect(f"file:{source}?mode=ro", uri=True) as conn:
+                return _table_stamp(conn) != stamp
+        except (OSError, ValueError, sqlite3.Error):
+            pass
+
+    # no stamp (or unreadable): fall back to mtimes, WAL included
+    newest = max(os.path.getmtime(p) for p in (source, source + "-wal") if os.path.exists(p))
+    return newest > _newest_mtime(path)
+
+
+def load_columns(name, columns=None, filter=None, source=None, root=HISTORY_ROOT):
+    # -> DataFrame with only `columns` (None = all), or None when the
+    #    dataset / pyarrow is unavailable — or behind `source`, the
+    #    file it was converted from. `filter` is a pyarrow
+    #    expression, e.g. ds.field("month") >= "2025-01".
+    if not available(name, root):
+        return None
+
+    path = dataset_path(name, root)
+    if source and os.path.exists(source) and _stale(path, source):
+        return None
+
+    dataset = ds.dataset(path, format="parquet", partitioning="hive")
+    return dataset.to_table(columns=columns, filter=filter).to_pandas()
+
+
+# ----------------------------------------------------------
+# 🚀 CLI
+# ----------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Columnar training-history tools.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    conv = sub.add_parser("convert", help="convert existing JSON/CSV/SQLite history")
+    conv.add_argument("--root", default=HISTORY_ROOT)
+    conv.add_argument("--db", default="progress.db")
+    conv.add_argument("--json", default="progress.json")
+    conv.add_argument("--csv", default="alpha_progress.csv")
+    args = parser.parse_args(argv)
+
+    # progress.db already holds everything progress.json had (see progress_store)
+    if os.path.exists(args.db):
+        print(f"{args.db}: {convert_progress_db(args.db, args.root)} attempts")
+    elif os.path.exists(args.json):
+        print(f"{args.json}: {convert_progress_json(args.json, args.root)} attempts")
+
+    if os.path.exists(args.csv):
+        print(f"{args.csv}: {convert_csv(args.csv, root=args.root)} rows")
+
+
+if __name__ == "__main__":
+    main()
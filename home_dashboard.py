@@ -3,12 +3,24 @@
 # ==============================================
 
 import streamlit as st
-import json
 import time
-import os
 
-# 🔴 REAL BROWSER MIC STREAM
-from live_stream import start_live_stream
+from content_store import get_store
+from drill_scheduler import get_scheduler, SCHEDULER_METRICS
+from instrumentation import timed, debug_panel
+
+
+# Live panels refresh on their own at these rates (seconds) — no
+# full-script rerun per metric update. Values are smoothed over the
+# processor's per-hop history, so a slow refresh loses nothing.
+METRICS_REFRESH_SECONDS = 0.5
+TIMER_REFRESH_SECONDS = 1
+
+# Window for the stability read-out under Current Resonance
+STABILITY_SECONDS = 5.0
+
+# Each sentence is on screen this long, then scored as one attempt
+SENTENCE_SECONDS = 3
 
 
 # --------------------------------------
@@ -20,24 +32,14 @@ st.title("⚡ Alpha Voice Mastery")
 # --------------------------------------
 # LOAD SENTENCES
 # --------------------------------------
+# The drill corpus (sentences.txt, see corpus_builder.py) is one
+# memory-mapped copy shared by every session; a session only keeps
+# sentence_index into it.
 def load_alpha_content():
     try:
-        paths = ['words.json', 'Alpha_Male_Deep_Voice/words.json']
-        data = {}
-
-        for p in paths:
-            if os.path.exists(p):
-                with open(p, 'r') as f:
-                    data = json.load(f)
-                break
-
-        all_content = []
-        for cat in data:
-            all_content.extend(
-                [s for s in data[cat] if len(str(s).split()) > 3]
-            )
-
-        return all_content if all_content else [
+        content = get_store().sentence_corpus()
+
+        return content if len(content) else [
             "Command the room with your resonance."
         ]
 
@@ -47,6 +49,16 @@ def load_alpha_content():
 
 all_sentences = load_alpha_content()
 
+# Picks the next sentence from this member's weak spots (drill_scheduler)
+scheduler = get_scheduler(all_sentences, deck="sentences")
+
+
+def current_sentence():
+    # -1 until the first START TRAINING
+    if st.session_state.sentence_index < 0:
+        return "Press START TRAINING"
+    return all_sentences[st.session_state.sentence_index % len(all_sentences)]
+
 
 # --------------------------------------
 # SESSION STATE INIT
@@ -57,15 +69,18 @@ if "is_recording" not in st.session_state:
 if "start_time" not in st.session_state:
     st.session_state.start_time = 0
 
-if "sentence_index" not in st.session_state:
-    st.session_state.sentence_index = 0
+if "session_start" not in st.session_state:
+    st.session_state.session_start = 0
 
-if "current_sentence" not in st.session_state:
-    st.session_state.current_sentence = "Press START TRAINING"
+if "sentence_index" not in st.session_state:
+    st.session_state.sentence_index = -1
 
 if "v_res" not in st.session_state:
     st.session_state.v_res = 0
 
+if "live_processor" not in st.session_state:
+    st.session_state.live_processor = None
+
 
 metrics = [
     "v_deep",
@@ -90,51 +105,89 @@ for m in metrics:
 with st.sidebar:
     target_goal = st.slider("🎯 Training Target", 50, 100, 85)
 
+debug_panel()
+
 
 # --------------------------------------
-# CONTROLS
+# LIVE FRAGMENTS
 # --------------------------------------
-c1, c2, c3 = st.columns([1, 1, 1])
+# Each fragment re-runs by itself on its timer while recording and
+# reads the processor's latest result directly.
+live_refresh = METRICS_REFRESH_SECONDS if st.session_state.is_recording else None
+timer_refresh = TIMER_REFRESH_SECONDS if st.session_state.is_recording else None
 
-with c1:
-    session_mins = st.selectbox("⏳ Session Duration", [1, 2, 3, 5])
 
-with c2:
+def pull_live_result():
+
+    processor = st.session_state.live_processor
+    res = processor.smoothed_result() if processor else None
+
+    # Update sliders ONLY when audio exists
+    if res:
+        # Alpha Frequency = how steady the measured F0 has been
+        f0_stats = processor.history.summary(seconds=STABILITY_SECONDS)["f0"]
+
+        st.session_state.update({
+            "v_deep": res['sub100'],
+            "v_alpha": res['alpha'],
+            "v_tone": res['chest'],
+            "v_clarity": res['gravel'],
+            "v_accent": res['gravel'],
+            "v_pitch": res['pitch'],
+            "v_freq": int(f0_stats['stability']) if f0_stats['mean'] > 0 else 0,
+            "v_chest": res['chest'],
+            "v_belly": res['belly'],
+            "v_res": res['alpha']
+        })
+
+    return res
+
+
+@st.fragment(run_every=timer_refresh)
+def session_timer():
+
     if not st.session_state.is_recording:
-        if st.button("🎤 START TRAINING", use_container_width=True):
-            st.session_state.is_recording = True
-            st.session_state.start_time = time.time()
-            st.session_state.sentence_index = 0
-            st.session_state.current_sentence = all_sentences[0]
-    else:
-        if st.button("🛑 STOP SESSION", use_container_width=True):
-            st.session_state.is_recording = False
+        return
 
-with c3:
-    if st.session_state.is_recording:
+    elapsed = int(time.time() - st.session_state.session_start)
+    remaining = max(0, st.session_state.session_mins * 60 - elapsed)
 
-        elapsed = int(time.time() - st.session_state.start_time)
-        remaining = max(0, session_mins * 60 - elapsed)
+    st.metric("Time Remaining", f"{remaining}s")
 
-        st.metric("Time Remaining", f"{remaining}s")
+    if remaining <= 0:
+        st.session_state.is_recording = False
+        st.session_state.live_processor = None
+        st.rerun()
 
-        if remaining <= 0:
-            st.session_state.is_recording = False
 
+@st.fragment(run_every=live_refresh)
+def sentence_panel():
 
-st.divider()
+    if st.session_state.is_recording:
 
+        res = pull_live_result()
 
-# --------------------------------------
-# MAIN LAYOUT
-# --------------------------------------
-col_left, col_right = st.columns([1.5, 1])
+        # 🔵 Move sentence SLOWLY — the sentence just read is scored
+        # on its hops; weak ones come back sooner
+        if res and time.time() - st.session_state.start_time > SENTENCE_SECONDS:
 
+            st.session_state.start_time = time.time()
 
-# --------------------------------------
-# SENTENCE DISPLAY
-# --------------------------------------
-with col_left:
+            history = st.session_state.live_processor.history
+            take = history.median(seconds=SENTENCE_SECONDS)
+            if take is not None:
+                scores = history.as_dict(take)
+                scheduler.record(
+                    st.session_state.sentence_index % len(all_sentences), scores,
+                    all(scores[m] >= target_goal for m in SCHEDULER_METRICS)
+                )
+
+            st.session_state.sentence_index = scheduler.next_item()
+
+        # recorded segments are split and named by the sentence on screen
+        processor = st.session_state.live_processor
+        if processor is not None and processor.recorder is not None:
+            processor.recorder.set_label(current_sentence())
 
     border_color = "#2ecc71" if st.session_state.v_res >= target_goal else "#00BCFF"
 
@@ -149,49 +202,22 @@ with col_left:
         align-items:center;
         justify-content:center;">
         <h1 style="color:white;text-align:center;font-family:serif;">
-        "{st.session_state.current_sentence}"
+        "{current_sentence()}"
         </h1>
     </div>
     """, unsafe_allow_html=True)
 
-    # --------------------------------------
-    # 🔴 REAL LIVE STREAM ENGINE
-    # --------------------------------------
-    if st.session_state.is_recording:
-
-        res = start_live_stream()
-
-        # Update sliders ONLY when audio exists
-        if res:
-
-            st.session_state.update({
-                "v_deep": res['sub100'],
-                "v_alpha": res['alpha'],
-                "v_tone": res['chest'],
-                "v_clarity": res['gravel'],
-                "v_accent": res['gravel'],
-                "v_pitch": res['sub100'],
-                "v_freq": res['sub100'],
-                "v_chest": res['chest'],
-                "v_belly": res['belly'],
-                "v_res": res['alpha']
-            })
-
-            # 🔵 Move sentence SLOWLY
-            if time.time() - st.session_state.start_time > 3:
 
-                st.session_state.start_time = time.time()
+@st.fragment(run_every=live_refresh)
+def metrics_panel():
+    with timed("page_render_seconds", page="home_metrics"):
+        _metrics_panel()
 
-                st.session_state.sentence_index += 1
-                st.session_state.current_sentence = all_sentences[
-                    st.session_state.sentence_index % len(all_sentences)
-                ]
 
+def _metrics_panel():
 
-# --------------------------------------
-# RIGHT SIDE SLIDERS
-# --------------------------------------
-with col_right:
+    if st.session_state.is_recording:
+        pull_live_result()
 
     st.subheader("📊 Alpha Metrics")
 
@@ -208,18 +234,84 @@ with col_right:
     st.markdown("---")
     st.write(f"### Current Resonance: {st.session_state.v_res}%")
 
+    processor = st.session_state.live_processor
+    summary = processor.history.summary(seconds=STABILITY_SECONDS) if processor else None
+    if summary:
+        a = summary["alpha"]
+        st.caption(f"Last {STABILITY_SECONDS:g}s — mean {a['mean']:.0f}% · "
+                   f"p90 {a['p90']:.0f}% · stability {a['stability']:.0f}% · "
+                   f"F0 ≈ {summary['f0']['mean']:.0f} Hz")
+
+    # --------------------------------------
+    # 🏆 HARD MODE MILESTONES
+    # --------------------------------------
+    scores = [st.session_state[m] for m in metrics]
+    min_score = min(scores)
+
+    st.markdown("---")
+
+    if min_score >= 97:
+        st.success("🔥 EXCELLENT — Real Alpha Deep Male Voice Achieved.")
+    elif min_score >= 85:
+        st.info("🚀 Bravo — Second Alpha Milestone reached.")
+    elif min_score >= 70:
+        st.warning("🧭 Level 1 Alpha Deep Voice unlocked.")
+
+
+# --------------------------------------
+# CONTROLS
+# --------------------------------------
+c1, c2, c3 = st.columns([1, 1, 1])
+
+with c1:
+    st.selectbox("⏳ Session Duration", [1, 2, 3, 5], key="session_mins")
+
+with c2:
+    if not st.session_state.is_recording:
+        if st.button("🎤 START TRAINING", use_container_width=True):
+            st.session_state.is_recording = True
+            st.session_state.start_time = time.time()
+            st.session_state.session_start = st.session_state.start_time
+            st.session_state.sentence_index = scheduler.next_item()
+            st.rerun()
+    else:
+        if st.button("🛑 STOP SESSION", use_container_width=True):
+            st.session_state.is_recording = False
+            st.session_state.live_processor = None
+            st.rerun()
+
+with c3:
+    session_timer()
+
+
+st.divider()
+
+
+# --------------------------------------
+# MAIN LAYOUT
+# --------------------------------------
+col_left, col_right = st.columns([1.5, 1])
+
 
 # --------------------------------------
-# 🏆 HARD MODE MILESTONES
+# SENTENCE DISPLAY
 # --------------------------------------
-scores = [st.session_state[m] for m in metrics]
-min_score = min(scores)
+with col_left:
 
-st.markdown("---")
+    sentence_panel()
 
-if min_score >= 97:
-    st.success("🔥 EXCELLENT — Real Alpha Deep Male Voice Achieved.")
-elif min_score >= 85:
-    st.info("🚀 Bravo — Second Alpha Milestone reached.")
-elif min_score >= 70:
-    st.warning("🧭 Level 1 Alpha Deep Voice unlocked.")
+    # --------------------------------------
+    # 🔴 REAL LIVE STREAM ENGINE
+    # --------------------------------------
+    # Rendered once per full run; the fragments poll the processor.
+    # streamlit_webrtc / av are only imported once training starts.
+    if st.session_state.is_recording:
+        from live_stream import start_live_processor
+        st.session_state.live_processor = start_live_processor()
+
+
+# --------------------------------------
+# RIGHT SIDE SLIDERS
+# --------------------------------------
+with col_right:
+    metrics_panel()
@@ -0,0 +1,241 @@
+# ==========================================================
+# 📟 HOT-PATH INSTRUMENTATION (opt-in)
+# Counters + latency histograms per pipeline stage
+# ==========================================================
+#
+#   ALPHA_METRICS=1               turn it on (off by default)
+#   ALPHA_METRICS_PORT=9464       also serve /metrics (Prometheus text)
+#                                 and /metrics.json on localhost
+#
+# Hot paths guard every call with `if METRICS:` — when disabled the
+# cost is one global lookup and a branch. Metrics are process-wide,
+# shared by every session, and safe to update from the WebRTC media
+# thread and the analysis workers.
+
+import bisect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+
+METRICS = os.getenv("ALPHA_METRICS", "0") == "1"
+METRICS_PORT = int(os.getenv("ALPHA_METRICS_PORT", "0") or 0)
+
+# Latency bucket upper bounds (seconds), Prometheus-style "le"
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+           0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+# Stage names used across the app (name -> help text)
+HELP = {
+    "live_frames_received": "WebRTC audio frames received by recv()",
+    "live_frames_backlog_dropped": "Frames dropped because the analysis worker fell behind",
+    "live_frames_silent": "Frames gated out by the live VAD before the FFT",
+    "live_windows_scored": "STFT windows scored by the live processor",
+    "live_analysis_seconds": "FFT + band sums + scoring per live window/batch",
+    "mic_buffers_silent": "Mic captures with no speech according to the VAD",
+    "mic_hops_silent": "Streamed mic blocks gated out by the VAD",
+    "mic_analysis_seconds": "Scoring time per captured mic buffer",
+    "mic_hop_seconds": "FFT + band sums per streamed mic hop",
+    "recording_samples_dropped": "Live samples not recorded because every buffer chunk was in flight",
+    "recording_segments_failed": "Recorded segments that could not be written to disk",
+    "gauge_build_seconds": "Plotly gauge construction (cache misses only)",
+    "content_load_seconds": "words.json parse",
+    "page_render_seconds": "Script time for instrumented page sections",
+}
+
+_lock = threading.Lock()
+_counters = {}
+_histograms = {}
+
+clock = time.perf_counter
+
+
+def _key(name, labels):
+    return (name, tuple(sorted(labels.items()))) if labels else (name, ())
+
+
+# ----------------------------------------------------------
+# ✍️ RECORDING
+# ----------------------------------------------------------
+def incr(name, n=1, **labels):
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + n
+
+
+def observe(name, seconds, **labels):
+    key = _key(name, labels)
+    with _lock:
+        h = _histograms.get(key)
+        if h is None:
+            # [per-bucket counts..., +Inf], sum, count
+            h = _histograms[key] = [[0] * (len(BUCKETS) + 1), 0.0, 0]
+        h[0][bisect.bisect_left(BUCKETS, seconds)] += 1
+        h[1] += seconds
+        h[2] += 1
+
+
+@contextmanager
+def timed(name, **labels):
+    # for page-level sections; hot loops use clock()/observe() directly
+    if not METRICS:
+        yield
+        return
+    t0 = clock()
+    try:
+        yield
+    finally:
+        observe(name, clock() - t0, **labels)
+
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+
+# ----------------------------------------------------------
+# 📤 EXPORT
+# ----------------------------------------------------------
+def _quantile(buckets, count, q):
+    # upper bound of the bucket holding the q-th observation
+    rank = q * count
+    seen = 0
+    for bound, n in zip(BUCKETS + (float("inf"),), buckets):
+        seen += n
+        if seen >= rank:
+            return bound
+    return float("inf")
+
+
+def snapshot():
+    # -> {"counters": {...}, "histograms": {...}} keyed "name{labels}"
+    with _lock:
+        counters = dict(_counters)
+        histograms = {k: (list(h[0]), h[1], h[2]) for k, h in _histograms.items()}
+
+    def label(key):
+        name, labels = key
+        if not labels:
+            return name
+        return name + "{" + ",".join(f'{k}="{v}"' for k, v in labels) + "}"
+
+    return {
+        "counters": {label(k): v for k, v in sorted(counters.items())},
+        "histograms": {
+            label(k): {
+                "count": count,
+                "mean_ms": 1000 * total / count if count else 0.0,
+                "p50_ms": 1000 * _quantile(b, count, 0.5),
+                "p99_ms": 1000 * _quantile(b, count, 0.99),
+            }
+            for k, (b, total, count) in sorted(histograms.items())
+        },
+    }
+
+
+def prometheus_text():
+    with _lock:
+        counters = dict(_counters)
+        histograms = {k: (list(h[0]), h[1], h[2]) for k, h in _histograms.items()}
+
+    def fmt(labels, extra=()):
+        pairs = list(labels) + list(extra)
+        return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}" if pairs else ""
+
+    lines = []
+    for name in sorted({k[0] for k in counters}):
+        lines.append(f"# HELP alpha_{name}_total {HELP.get(name, name)}")
+        lines.append(f"# TYPE alpha_{name}_total counter")
+        for (n, labels), v in sorted(counters.items()):
+            if n == name:
+                lines.append(f"alpha_{name}_total{fmt(labels)} {v}")
+
+    for name in sorted({k[0] for k in histograms}):
+        lines.append(f"# HELP alpha_{name} {HELP.get(name, name)}")
+        lines.append(f"# TYPE alpha_{name} histogram")
+        for (n, labels), (buckets, total, count) in sorted(histograms.items()):
+            if n != name:
+                continue
+            cumulative = 0
+            for bound, c in zip(BUCKETS + ("+Inf",), buckets):
+                cumulative += c
+                lines.append(f"alpha_{name}_bucket{fmt(labels, [('le', bound)])} {cumulative}")
+            lines.append(f"alpha_{name}_sum{fmt(labels)} {total}")
+            lines.append(f"alpha_{name}_count{fmt(labels)} {count}")
+
+    return "\n".join(lines) + "\n"
+
+
+# ----------------------------------------------------------
+# 🌐 LOCAL ENDPOINT
+# ----------------------------------------------------------
+_server = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port=METRICS_PORT, host="127.0.0.1"):
+    # One tiny HTTP server per process; a no-op when disabled/no port
+    global _server
+
+    if not METRICS or not port:
+        return None
+
+    with _server_lock:
+        if _server is not None:
+            return _server
+
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == "/metrics":
+                    body, ctype = prometheus_text(), "text/plain; version=0.0.4"
+                elif self.path == "/metrics.json":
+                    body, ctype = json.dumps(snapshot()), "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                data = body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        try:
+            _server = ThreadingHTTPServer((host, port), _Handler)
+        except OSError:
+            # another server process already owns the port
+            return None
+
+        threading.Thread(target=_server.serve_forever, name="alpha-metrics", daemon=True).start()
+        return _server
+
+
+# ----------------------------------------------------------
+# 🐞 SIDEBAR DEBUG PANEL
+# ----------------------------------------------------------
+def debug_panel():
+    # Pages call this unconditionally; it draws nothing unless enabled
+    if not METRICS:
+        return
+
+    import streamlit as st
+
+    start_metrics_server()
+    snap = snapshot()
+
+    with st.sidebar.expander("🐞 Pipeline metrics"):
+        if not snap["counters"] and not snap["histograms"]:
+            st.caption("No samples yet.")
+        for name, v in snap["counters"].items():
+            st.text(f"{name}: {v}")
+        for name, h in snap["histograms"].items():
+            st.text(f"{name}: n={h['count']} mean={h['mean_ms']:.2f}ms "
+                    f"p50≤{h['p50_ms']:g}ms p99≤{h['p99_ms']:g}ms")
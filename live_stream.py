@@ -4,54 +4,200 @@
 # Real Browser Mic Streaming Engine
 # ==========================================================
 
+import os
+import threading
+from collections import deque
+
 import numpy as np
 from streamlit_webrtc import webrtc_streamer, AudioProcessorBase, WebRtcMode
 import av
 
+from resonance_dsp import (ResonanceScorer, StftRingBuffer, get_pitch_tracker, pitch_score,
+                           frame_to_mono, LIVE_PROFILE)
+from analysis_pool import SharedFrameBatch
+from instrumentation import METRICS, clock, incr, observe
+from voice_activity import EnergyVad
+from result_history import ResultHistory
+from session_recorder import SessionRecorder, RECORD_AUDIO
+
+
+SAMPLE_RATE = 48000
+
+# STFT analysis window / hop (samples). 4096 / 1024 = ~85 ms window,
+# scored every ~21 ms.
+STFT_WINDOW = 4096
+STFT_HOP = 1024
+
+# Where scoring runs:
+#   "inline" — inside recv() on the WebRTC media thread
+#   "thread" — recv() only enqueues; a worker thread scores
+#   "process" — like "thread", but FFT batches go to the shared
+#               multi-process pool (analysis_pool, ALPHA_ANALYSIS_WORKERS)
+ANALYSIS_MODE = os.getenv("ALPHA_ANALYSIS_MODE", "thread")
+
+# Frames kept waiting for the worker (~2 s of 20 ms frames). When the
+# worker falls behind the oldest frames are dropped, never recv().
+MAX_PENDING_FRAMES = 100
+
+# The UI reads an EMA over this much recent history, not one hop
+SMOOTH_SECONDS = 1.0
+
 
 # ----------------------------------------------------------
 # 🎤 ULTRA PROCESSOR
 # ----------------------------------------------------------
 class AlphaResonanceProcessor(AudioProcessorBase):
 
-    def __init__(self):
+    # Frames are collected in a ring buffer and scored once per hop
+    # on a Hann-windowed STFT frame (4096 @ 48 kHz ≈ 11.7 Hz bins, so
+    # the belly / sub100 zones get several bins each).
+
+    def __init__(self, window=STFT_WINDOW, hop=STFT_HOP,
+                 sample_rate=SAMPLE_RATE, mode=ANALYSIS_MODE, record=RECORD_AUDIO):
         self.latest_result = None
         self.prev_energy = 0
+        self.prev_f0 = 0.0
+
+        self.sample_rate = sample_rate
+        self.ring = StftRingBuffer(window=window, hop=hop)
+        self.vad = EnergyVad(sample_rate, full_scale=32768.0)  # frames are raw s16
+        self.scorer = ResonanceScorer(LIVE_PROFILE, sample_rate, window)
+        self.pitch = get_pitch_tracker(sample_rate, window)
+        # every scored hop, newest last (see result_history)
+        self.history = ResultHistory(self.scorer.features + ("alpha", "pitch", "f0"))
+        self.mode = mode
+
+        # optional raw capture for later re-scoring (session_recorder)
+        self.recorder = SessionRecorder(sample_rate) if record else None
+
+        if self.mode == "process":
+            self._batch = SharedFrameBatch(window, sample_rate, "live")
+
+        if self.mode in ("thread", "process"):
+            self._pending = deque(maxlen=MAX_PENDING_FRAMES)
+            self._wake = threading.Event()
+            self._stopped = threading.Event()
+            self._worker = threading.Thread(
+                target=self._drain_loop,
+                name="alpha-analysis",
+                daemon=True
+            )
+            self._worker.start()
 
     def recv(self, frame: av.AudioFrame):
 
-        audio = frame.to_ndarray().flatten().astype(np.float32)
+        # one mono copy for both the recorder and the analysis
+        pcm = frame_to_mono(frame)
+        if self.recorder is not None:
+            self.recorder.write(pcm)
+
+        audio = pcm.astype(np.float32)
+
+        if METRICS:
+            incr("live_frames_received")
+
+        if self.mode in ("thread", "process"):
+            if METRICS and len(self._pending) == MAX_PENDING_FRAMES:
+                incr("live_frames_backlog_dropped")
+
+            # deque.append is atomic — no lock on the media path
+            self._pending.append(audio)
+            self._wake.set()
+        else:
+            self._analyze(audio)
+
+        return frame
+
+    def on_ended(self):
+        if self.recorder is not None:
+            self.recorder.close()
+
+        if self.mode in ("thread", "process"):
+            self._stopped.set()
+            self._wake.set()
+
+    # ------------------------------------------------------
+    # 🧵 ANALYSIS WORKER
+    # ------------------------------------------------------
+    def _drain_loop(self):
+        while not self._stopped.is_set():
+            self._wake.wait(0.5)
+            self._wake.clear()
+
+            while self._pending:
+                try:
+                    audio = self._pending.popleft()
+                except IndexError:
+                    break
+                self._analyze(audio)
+
+            if self.mode == "process":
+                self._flush_batch()
+
+        if self.mode == "process":
+            self._batch.close()
+
+    def _flush_batch(self):
+        t0 = clock() if METRICS else 0.0
+
+        scored = self._batch.score()
+        if scored is None:
+            return
+
+        if METRICS:
+            observe("live_analysis_seconds", clock() - t0, mode="process")
+            incr("live_windows_scored", len(scored[1]))
+
+        zones, totals, f0s = scored
+        for row, total, f0 in zip(zones, totals, f0s):
+            self._publish(row, total, f0)
+
+    def _analyze(self, audio):
 
         # --------------------------------------------------
         # 🛑 SILENCE GUARD (NO FAKE ANALYSIS)
         # --------------------------------------------------
-        peak = np.max(np.abs(audio))
-        if peak < 0.02:
-            return frame
+        # Adaptive VAD per session: non-speech frames only advance the
+        # ring buffer — no taper, no FFT, no scoring.
+        if not self.vad.update(audio):
+            self.ring.write(audio)
+            if METRICS:
+                incr("live_frames_silent")
+            return
 
-        # --------------------------------------------------
-        # FFT ANALYSIS
-        # --------------------------------------------------
-        fft = np.abs(np.fft.rfft(audio))
-        freqs = np.fft.rfftfreq(len(audio), 1 / 48000)
+        for windowed in self.ring.push(audio):
+            if self.mode == "process":
+                self._batch.add(windowed)
+                if self._batch.full:
+                    self._flush_batch()
+            else:
+                self._score_window(windowed)
 
-        total_energy = np.sum(fft) + 1e-10
+    def _score_window(self, windowed):
 
         # --------------------------------------------------
-        # 🎯 FREQUENCY ZONES (ARJUN DAS STYLE)
+        # FFT ANALYSIS
         # --------------------------------------------------
+        t0 = clock() if METRICS else 0.0
 
-        # DEEP SUB BASS (throat depth)
-        sub_zone = np.sum(fft[(freqs >= 50) & (freqs <= 95)])
+        zones, total_energy = self.scorer.zones(windowed)
+        f0, _ = self.pitch.from_magnitude(self.scorer.magnitude()[0])
+        self._publish(zones, total_energy, f0)
 
-        # CHEST RESONANCE CORE
-        chest_zone = np.sum(fft[(freqs >= 120) & (freqs <= 300)])
+        if METRICS:
+            observe("live_analysis_seconds", clock() - t0, mode=self.mode)
+            incr("live_windows_scored")
 
-        # BELLY SUPPORT / DIAPHRAGM FLOW
-        belly_zone = np.sum(fft[(freqs >= 20) & (freqs <= 60)])
+    def _publish(self, zones, total_energy, f0=0.0):
 
-        # CLARITY / GRAVEL TEXTURE
-        gravel_zone = np.sum(fft[(freqs >= 2500) & (freqs <= 5000)])
+        # --------------------------------------------------
+        # 🎯 FREQUENCY ZONES (ARJUN DAS STYLE)
+        # --------------------------------------------------
+        # DEEP SUB BASS (throat depth)        50–95 Hz
+        # CHEST RESONANCE CORE               120–300 Hz
+        # BELLY SUPPORT / DIAPHRAGM FLOW      20–60 Hz
+        # CLARITY / GRAVEL TEXTURE         2500–5000 Hz
+        sub_zone, chest_zone, belly_zone, gravel_zone = zones
 
         # --------------------------------------------------
         # 🫀 CHEST VIBRATION DETECTOR (NEW)
@@ -66,38 +212,46 @@ class AlphaResonanceProcessor(AudioProcessorBase):
         vibration_score = min(100, vibration_score)
 
         # --------------------------------------------------
-        # 🔥 HARD MODE SCORING
+        # 🔥 HARD MODE SCORING (LIVE_PROFILE)
         # --------------------------------------------------
-        sub100 = min(100, int((sub_zone / total_energy) * 2500))
-        chest  = min(100, int((chest_zone / total_energy) * 1700))
-        belly  = min(100, int((belly_zone / total_energy) * 4200))
-        gravel = min(100, int((gravel_zone / total_energy) * 2600))
-
-        # ULTRA ALPHA SCORE
-        alpha = int(
-            (sub100 * 0.40) +
-            (chest  * 0.30) +
-            (vibration_score * 0.20) +
-            (gravel * 0.10)
+        # sub100 x2500, chest x1700, belly x4200, gravel x2600
+        # ULTRA ALPHA = sub100*0.40 + chest*0.30
+        #             + vibration*0.20 + gravel*0.10
+        scores, alpha = self.scorer.score_zones(
+            zones, total_energy, extra={"vibration": vibration_score}
         )
 
-        self.latest_result = {
-            "sub100": sub100,
-            "chest": chest,
-            "belly": belly,
-            "gravel": gravel,
-            "alpha": alpha,
-            "vibration": vibration_score
-        }
+        # --------------------------------------------------
+        # 🎼 PITCH — unvoiced hops hold the last voiced F0
+        # --------------------------------------------------
+        if f0 > 0:
+            self.prev_f0 = f0
+        f0 = self.prev_f0
+        pitch = float(pitch_score(f0))
+
+        self.history.append(scores, alpha, pitch, f0)
 
-        return frame
+        # single reference swap — readers never see a half-built dict
+        result = self.scorer.to_dict(scores, alpha)
+        result["pitch"] = int(pitch)
+        result["f0"] = int(round(f0))
+        self.latest_result = result
+
+    def smoothed_result(self, seconds=SMOOTH_SECONDS):
+        # EMA of the last `seconds` of hops, same keys as latest_result
+        smoothed = self.history.ema(seconds=seconds)
+        if smoothed is None:
+            return None
+        return self.history.as_dict(smoothed)
 
 
 # ----------------------------------------------------------
 # 🚀 START LIVE STREAM
 # ----------------------------------------------------------
-def start_live_stream():
+def start_live_processor():
 
+    # Renders the mic widget; returns the session's processor (or None
+    # until the browser connects). Callers poll .latest_result.
     ctx = webrtc_streamer(
         key="alpha-resonance-v2",
         mode=WebRtcMode.SENDRECV,
@@ -105,11 +259,14 @@ def start_live_stream():
         media_stream_constraints={"audio": True, "video": False},
     )
 
-    if ctx.audio_processor:
-        return ctx.audio_processor.latest_result
+    return ctx.audio_processor
 
-    return None
 
+def start_live_stream():
 
+    processor = start_live_processor()
 
+    if processor:
+        return processor.latest_result
 
+    return None
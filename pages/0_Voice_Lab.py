@@ -1,6 +1,7 @@
 import streamlit as st
-import plotly.graph_objects as go
 from voice_engine import analyze_mic_input
+from gauges import make_gauge, render_gauge, light_gauge_toggle
+from instrumentation import timed, debug_panel
 
 # --- NO SET_PAGE_CONFIG HERE (It's already in app.py) ---
 
@@ -8,13 +9,11 @@ st.title("🎙️ Alpha Voice Lab: Original Full Analysis")
 st.write("First 50 Alpha Members: This is your high-precision resonance lab.")
 
 def create_gauge(label, value, color):
-    fig = go.Figure(go.Indicator(
-        mode="gauge+number", value=value,
-        title={'text': label, 'font': {'color': 'white', 'size': 16}},
-        gauge={'axis': {'range': [0, 100]}, 'bar': {'color': color}}
-    ))
-    fig.update_layout(paper_bgcolor='rgba(0,0,0,0)', font={'color': "white"}, height=200, margin=dict(l=10,r=10,t=40,b=10))
-    return fig
+    # memoized per (label, value, color); SVG in lite mode — see gauges.py
+    return make_gauge(label, value, color, theme="lab")
+
+light_gauge_toggle()
+debug_panel()
 
 # Initialize session state for the "Auto-Flash" sliders if not present
 if 'scores' not in st.session_state:
@@ -22,8 +21,13 @@ if 'scores' not in st.session_state:
 
 if st.button("🔴 START ANALYSIS", use_container_width=True):
     with st.spinner("Analyzing resonance, pitch, and accent..."):
-        # Get data from the brain
-        res = analyze_mic_input(duration=3)
+        # Get data from the brain (streamed, scored every hop)
+        live_bar = st.progress(0.0, text="Listening...")
+        res = analyze_mic_input(
+            duration=3,
+            on_update=lambda p, r: live_bar.progress(p, text=f"Listening... Alpha Depth {r['alpha']}%")
+        )
+        live_bar.empty()
         st.session_state.scores = res
         
         # --- TOP SECTION: THE ORIGINAL SLIDERS (HORIZONTAL) ---
@@ -43,8 +47,9 @@ if st.button("🔴 START ANALYSIS", use_container_width=True):
         # --- BOTTOM SECTION: THE RADIAL GAUGES (PRO VIEW) ---
         st.markdown("### 🎯 Frequency Analysis")
         g1, g2, g3 = st.columns(3)
-        with g1: st.plotly_chart(create_gauge("Chest Power", s['chest'], "#3498db"), use_container_width=True)
-        with g2: st.plotly_chart(create_gauge("Belly Input", s['belly'], "#e67e22"), use_container_width=True)
-        with g3: st.plotly_chart(create_gauge("Alpha Depth", s['alpha'], "#9b59b6"), use_container_width=True)
+        with timed("page_render_seconds", page="lab_gauges"):
+            with g1: render_gauge(create_gauge("Chest Power", s['chest'], "#3498db"))
+            with g2: render_gauge(create_gauge("Belly Input", s['belly'], "#e67e22"))
+            with g3: render_gauge(create_gauge("Alpha Depth", s['alpha'], "#9b59b6"))
 
         st.success("Analysis Complete!")
\ No newline at end of file
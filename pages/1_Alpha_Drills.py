@@ -1,45 +1,45 @@
 import streamlit as st
-import json
-import random
 import time
-import os
-import plotly.graph_objects as go
-from voice_engine import analyze_mic_input # Ensure voice_engine.py is in your root folder
+from gauges import make_gauge, render_gauge, light_gauge_toggle
+from instrumentation import timed, debug_panel
+from voice_engine import analyze_mic_input, mic_history # Ensure voice_engine.py is in your root folder
+from content_store import get_store
+from progress_store import get_progress_store
+from drill_scheduler import get_scheduler
 
 # --- SECTION 1: DATA LOADING ---
+DRILL_LEVELS = (
+    "Level_1_Chest_Resonance",
+    "Level_2_Belly_Involvement",
+    "Level_3_Gravel_Texture",
+    "Level_4_Alpha_Mastery",
+    "Level_5_Sentences",
+)
+
+# Scores that must all reach DRILL_PASS_SCORE for a drill to count as
+# mastered (windowed scoring — see the calibration note in voice_engine)
+DRILL_METRICS = ("sub100", "chest", "gravel", "belly", "alpha")
+DRILL_PASS_SCORE = 85
+
 def load_alpha_words():
+    # shared memory-mapped word list; the session only keeps word_idx
     try:
-        with open('words.json', 'r') as f:
-            data = json.load(f)
-        return (
-            data.get("Level_1_Chest_Resonance", []) + 
-            data.get("Level_2_Belly_Involvement", []) + 
-            data.get("Level_3_Gravel_Texture", []) + 
-            data.get("Level_4_Alpha_Mastery", []) +
-            data.get("Level_5_Sentences", [])
-        )
+        words = get_store().level_corpus(DRILL_LEVELS)
+        return words if len(words) else ["GROUND", "BOOM", "ALPHA VOICE", "RESONANCE"]
     except Exception as e:
         return ["GROUND", "BOOM", "ALPHA VOICE", "RESONANCE"]
 
 # --- SECTION 2: UI GENERATORS ---
 def create_meter(label, value, color):
-    fig = go.Figure(go.Indicator(
-        mode="gauge+number",
-        value=value,
-        title={'text': label, 'font': {'size': 18, 'color': '#111'}},
-        gauge={
-            'axis': {'range': [0, 100], 'tickwidth': 1},
-            'bar': {'color': color},
-            'bgcolor': "rgba(255,255,255,0.05)",
-            'threshold': {'line': {'color': "white", 'width': 4}, 'value': 85}
-        }
-    ))
-    fig.update_layout(paper_bgcolor='rgba(0,0,0,0)', font={'color': "white"}, height=220, margin=dict(l=20,r=20,t=50,b=20))
-    return fig
+    # memoized per (label, value, color); SVG in lite mode — see gauges.py
+    return make_gauge(label, value, color, theme="drill")
 
 # --- SECTION 3: SESSION STATE ---
-if 'all_words' not in st.session_state: st.session_state.all_words = load_alpha_words()
-if 'word_idx' not in st.session_state: st.session_state.word_idx = 0
+all_words = load_alpha_words()
+# weakest / overdue word first, then new ones — see drill_scheduler.py
+scheduler = get_scheduler(all_words, deck="drills")
+
+if 'word_idx' not in st.session_state: st.session_state.word_idx = scheduler.next_item()
 if 'chance' not in st.session_state: st.session_state.chance = 1
 if 'timer' not in st.session_state: st.session_state.timer = 30
 if 'last_scores' not in st.session_state: 
@@ -48,14 +48,14 @@ if 'last_scores' not in st.session_state:
 # --- SECTION 4: MAIN DASHBOARD UI ---
 st.title("🏋️ Alpha Drill: The 1,000 Word Gym")
 
-current_word = st.session_state.all_words[st.session_state.word_idx % len(st.session_state.all_words)]
+current_word = all_words[st.session_state.word_idx % len(all_words)]
 is_sentence = len(current_word.split()) > 1
 
 # Progress Dashboard
 c1, c2, c3 = st.columns(3)
 c1.metric("⏳ Timer", f"{st.session_state.timer}s")
 c2.metric("🎯 Chance", f"{st.session_state.chance} / 5")
-c3.metric("📚 Progress", f"{st.session_state.word_idx + 1} / {len(st.session_state.all_words)}")
+c3.metric("📚 Practised", f"{len(scheduler)} / {len(all_words)}")
 
 # Big Display
 border_color = "#00FF00" if not is_sentence else "#00BCFF"
@@ -71,11 +71,15 @@ col1, col2, col3 = st.columns(3)
 col4, col5 = st.columns(2)
 s = st.session_state.last_scores
 
-with col1: st.plotly_chart(create_meter("Chest Power", s['chest'], "#3498db"), use_container_width=True)
-with col2: st.plotly_chart(create_meter("Belly Drive", s['belly'], "#e67e22"), use_container_width=True)
-with col3: st.plotly_chart(create_meter("Gravel", s['gravel'], "#2ecc71"), use_container_width=True)
-with col4: st.plotly_chart(create_meter("Sub-100Hz", s['sub100'], "#e74c3c"), use_container_width=True)
-with col5: st.plotly_chart(create_meter("Alpha Depth", s['alpha'], "#9b59b6"), use_container_width=True)
+light_gauge_toggle()
+debug_panel()
+
+with timed("page_render_seconds", page="drills_gauges"):
+    with col1: render_gauge(create_meter("Chest Power", s['chest'], "#3498db"))
+    with col2: render_gauge(create_meter("Belly Drive", s['belly'], "#e67e22"))
+    with col3: render_gauge(create_meter("Gravel", s['gravel'], "#2ecc71"))
+    with col4: render_gauge(create_meter("Sub-100Hz", s['sub100'], "#e74c3c"))
+    with col5: render_gauge(create_meter("Alpha Depth", s['alpha'], "#9b59b6"))
 
 # --- SECTION 5: INTERACTION & SAVING ---
 rec_duration = 5 if is_sentence else 2
@@ -83,14 +87,42 @@ btn_label = f"🎤 RECORD {'SENTENCE' if is_sentence else 'WORD'} ({rec_duration
 
 if st.button(btn_label, use_container_width=True, type="primary"):
     with st.spinner(f"Alpha Ear listening for {rec_duration}s..."):
-        scores = analyze_mic_input(duration=rec_duration) 
+        live_bar = st.progress(0.0, text="Listening...")
+        hops = mic_history(rec_duration)
+        scores = analyze_mic_input(
+            duration=rec_duration,
+            on_update=lambda p, r: live_bar.progress(p, text=f"Listening... Alpha Depth {r['alpha']}%"),
+            history=hops
+        )
+        live_bar.empty()
         st.session_state.last_scores = scores
-        
-        # Perfection Check: All parameters must be >= 85
-        if all(val >= 85 for val in scores.values()):
+
+        # Perfection Check: All parameters must be >= DRILL_PASS_SCORE —
+        # judged on the per-hop median when hops were scored, so one loud
+        # spike cannot pass a take and one dropout cannot fail it
+        check = hops.as_dict(hops.median()) if len(hops) else scores
+        passed = scores.get("speech_detected") and all(check[m] >= DRILL_PASS_SCORE for m in DRILL_METRICS)
+
+        # every spoken take feeds the scheduler and is stored with its
+        # verdict (failed takes let threshold_whatif.py re-judge rules);
+        # silence does not count
+        if scores.get("speech_detected"):
+            scheduler.record(st.session_state.word_idx % len(all_words), check, passed)
+            st.session_state.word_idx = scheduler.next_item()
+
             # --- PROGRESS SAVING LOGIC ---
-            new_entry = scores.copy()
+            # store the numbers that were judged; the whole-take scores
+            # ride along in `extra` when they differ
+            new_entry = {**scores, **check}
+            if check is not scores:
+                new_entry['take_scores'] = {m: scores[m] for m in DRILL_METRICS}
             new_entry['word'] = current_word
             new_entry['timestamp'] = time.time()
-            
-            history = []
\ No newline at end of file
+
+            # one O(1) append — no whole-file progress.json rewrite
+            get_progress_store().record_attempt(new_entry, passed=passed)
+
+        if passed:
+            st.success(f"✅ '{current_word}' mastered and saved to your progress.")
+
+        st.caption(f"➡️ Next up: {all_words[st.session_state.word_idx % len(all_words)]}")
@@ -1,20 +1,11 @@
 import streamlit as st
-import json
-import os
 from voice_engine import analyze_mic_input
+from content_store import get_store
 
 # --- 1. DATA LOADING ---
 def load_alpha_words():
     try:
-        paths = ['words.json', 'Alpha_Male_Deep_Voice/words.json']
-        data = {}
-        for p in paths:
-            if os.path.exists(p):
-                with open(p, 'r') as f: data = json.load(f)
-                break
-        words = []
-        for cat in data:
-            words.extend([w for w in data[cat] if len(str(w).split()) == 1])
+        words = get_store().with_tokens(1)
         return words if words else ["ALPHA"]
     except: return ["POWER"]
 
@@ -65,10 +56,14 @@ with c5: display_stat("Overall Score", st.session_state.w_overall)
 st.write("###")
 if st.button("🎤 ANALYZE WORD", width='stretch', type="primary"):
     with st.spinner("Processing Resonance..."):
-        res = analyze_mic_input(duration=2)
+        live_bar = st.progress(0.0, text="Listening...")
+        res = analyze_mic_input(
+            duration=2,
+            on_update=lambda p, r: live_bar.progress(p, text=f"Listening... Alpha Depth {r['alpha']}%")
+        )
         st.session_state.update({
             "w_deep": res['sub100'], "w_depth": res['alpha'],
-            "w_freq": res['sub100'], "w_tone": res['chest'],
+            "w_freq": res['pitch'], "w_tone": res['chest'],
             "w_overall": res['alpha']
         })
         st.session_state.w_idx += 1
@@ -1,48 +1,57 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-import json
-import os
+from progress_store import get_progress_store
 
 st.set_page_config(page_title="Alpha Progress Stats", layout="wide")
 
 # --- LOAD DATA ---
+# Running totals + per-day buckets are kept up to date on every save,
+# so this page never scans the full history unless asked to.
+store = get_progress_store()
+
 def load_history():
-    if os.path.exists('progress.json'):
-        with open('progress.json', 'r') as f:
-            return json.load(f)
-    return []
+    # indexed read from progress.db (progress.json is migrated on first open)
+    return store.history()
 
 st.title("📈 Alpha Progress Analytics")
 
-history = load_history()
+summary = store.summary()
 
-if not history:
+if not summary:
     st.info("No training data found. Complete some drills to see your stats!")
 else:
-    df = pd.DataFrame(history)
-    
     # --- METRICS ROW ---
     c1, c2, c3 = st.columns(3)
-    c1.metric("Total Words Mastered", len(df))
-    c2.metric("Avg Alpha Depth", f"{int(df['alpha'].mean())}%")
-    c3.metric("Peak Resonance", f"{df['alpha'].max()}%")
+    c1.metric("Total Words Mastered", summary['count'])
+    c2.metric("Avg Alpha Depth", f"{int(summary['avg_alpha'])}%")
+    c3.metric("Peak Resonance", f"{summary['max_alpha']}%")
 
-    # --- PROGRESS OVER TIME ---
+    # --- PROGRESS OVER TIME (one point per training day) ---
     st.subheader("Vocal Growth Timeline")
-    fig_line = px.line(df, x=df.index, y=['chest', 'belly', 'gravel', 'alpha'],
+    timeline = pd.DataFrame(store.daily_timeline())
+    fig_line = px.line(timeline, x='day', y=['chest', 'belly', 'gravel', 'alpha'],
                       title="Resonance Evolution",
-                      labels={'index': 'Attempts', 'value': 'Percentage'},
+                      labels={'day': 'Training Day', 'value': 'Percentage'},
                       template="plotly_dark",
                       color_discrete_sequence=["#3498db", "#e67e22", "#2ecc71", "#9b59b6"])
     st.plotly_chart(fig_line, use_container_width=True)
 
     # --- VOCAL PROFILE (Radar Chart) ---
     st.subheader("Alpha Vocal Profile")
-    avg_scores = df[['chest', 'belly', 'gravel', 'sub100']].mean().reset_index()
-    avg_scores.columns = ['Metric', 'Score']
+    avg_scores = pd.DataFrame({
+        'Metric': ['chest', 'belly', 'gravel', 'sub100'],
+        'Score': [summary['avg'][m] for m in ['chest', 'belly', 'gravel', 'sub100']],
+    })
     
     fig_radar = px.line_polar(avg_scores, r='Score', theta='Metric', line_close=True,
                              template="plotly_dark", color_discrete_sequence=["#00FF00"])
     fig_radar.update_traces(fill='toself')
-    st.plotly_chart(fig_radar, use_container_width=True)
\ No newline at end of file
+    st.plotly_chart(fig_radar, use_container_width=True)
+
+    # --- RAW HISTORY (loaded only on request) ---
+    with st.expander("🔍 Every attempt"):
+        if st.toggle("Load full history", key="load_raw_history"):
+            df = pd.DataFrame(load_history())
+            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='s')
+            st.dataframe(df, use_container_width=True)
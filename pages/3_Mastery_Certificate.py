@@ -1,15 +1,21 @@
 import streamlit as st
 import pandas as pd
 import os
+from history_columnar import load_columns, ALPHA_PROGRESS_DATASET
 
 st.set_page_config(page_title="Alpha Mastery Certificate", page_icon="📜")
 
 st.title("📜 Alpha Mastery Recognition")
 
-if not os.path.exists("alpha_progress.csv"):
+# Only the score column is needed: read it from the Parquet history
+# when it is current, else from just that column of the CSV
+df = load_columns(ALPHA_PROGRESS_DATASET, ["Alpha_Score"], source="alpha_progress.csv")
+if df is None and os.path.exists("alpha_progress.csv"):
+    df = pd.read_csv("alpha_progress.csv", usecols=["Alpha_Score"])
+
+if df is None:
     st.warning("No training data found. Start training in Alpha Home to unlock your path to mastery.")
 else:
-    df = pd.read_csv("alpha_progress.csv")
     total_goals_met = len(df)
     highest_score = df["Alpha_Score"].max()
 
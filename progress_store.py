@@ -0,0 +1,354 @@
+# ==========================================================
+# 📈 ALPHA PROGRESS STORE
+# Append-only SQLite (WAL) history of drill attempts
+# ==========================================================
+#
+# Replaces the whole-file progress.json rewrite: each saved attempt is
+# one INSERT, reads go through (user, ts) / (user, word, ts) indexes,
+# and WAL mode lets many sessions append while the stats page reads.
+# An existing progress.json is imported once on first open.
+#
+# Every spoken drill take is stored with a `passed` flag, so rules can
+# be re-judged offline (threshold_whatif.py). The running totals, the
+# timeline and history() count passed takes only — "words mastered".
+
+import json
+import os
+import sqlite3
+import threading
+
+
+DB_PATH = "progress.db"
+LEGACY_JSON_PATH = "progress.json"
+
+# Until real accounts exist every member trains as this user
+DEFAULT_USER = "alpha"
+
+METRIC_COLUMNS = ("sub100", "chest", "gravel", "belly", "alpha")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS attempts (
+    id      INTEGER PRIMARY KEY,
+    user    TEXT    NOT NULL,
+    word    TEXT,
+    ts      REAL    NOT NULL,
+    sub100  INTEGER,
+    chest   INTEGER,
+    gravel  INTEGER,
+    belly   INTEGER,
+    alpha   INTEGER,
+    extra   TEXT,
+    passed  INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS idx_attempts_user_ts ON attempts (user, ts);
+CREATE INDEX IF NOT EXISTS idx_attempts_user_word_ts ON attempts (user, word, ts);
+
+-- Drill scheduler state: one row per (user, deck, item) ever scored,
+-- upserted after each attempt (see drill_scheduler.py)
+CREATE TABLE IF NOT EXISTS drill_state (
+    user        TEXT    NOT NULL,
+    deck        TEXT    NOT NULL,
+    item        INTEGER NOT NULL,
+    word        TEXT,
+    deficit     REAL    NOT NULL,
+    streak      INTEGER NOT NULL,
+    last_seen   REAL    NOT NULL,
+    due         REAL    NOT NULL,
+    PRIMARY KEY (user, deck, item)
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key     TEXT PRIMARY KEY,
+    value   TEXT
+);
+
+-- Running aggregates, kept current by the trigger below so the stats
+-- page never has to scan attempts.
+CREATE TABLE IF NOT EXISTS user_totals (
+    user        TEXT PRIMARY KEY,
+    n           INTEGER NOT NULL,
+    sum_sub100  REAL NOT NULL,
+    sum_chest   REAL NOT NULL,
+    sum_gravel  REAL NOT NULL,
+    sum_belly   REAL NOT NULL,
+    sum_alpha   REAL NOT NULL,
+    max_alpha   INTEGER
+);
+
+-- Per-day (UTC) buckets: the downsampled timeline
+CREATE TABLE IF NOT EXISTS daily_totals (
+    user        TEXT NOT NULL,
+    day         TEXT NOT NULL,
+    n           INTEGER NOT NULL,
+    sum_sub100  REAL NOT NULL,
+    sum_chest   REAL NOT NULL,
+    sum_gravel  REAL NOT NULL,
+    sum_belly   REAL NOT NULL,
+    sum_alpha   REAL NOT NULL,
+    max_alpha   INTEGER,
+    PRIMARY KEY (user, day)
+);
+
+CREATE TRIGGER IF NOT EXISTS attempts_totals AFTER INSERT ON attempts
+WHEN NEW.passed
+BEGIN
+    INSERT INTO user_totals VALUES (
+        NEW.user, 1,
+        COALESCE(NEW.sub100, 0), COALESCE(NEW.chest, 0), COALESCE(NEW.gravel, 0),
+        COALESCE(NEW.belly, 0), COALESCE(NEW.alpha, 0), NEW.alpha
+    )
+    ON CONFLICT (user) DO UPDATE SET
+        n = n + 1,
+        sum_sub100 = sum_sub100 + excluded.sum_sub100,
+        sum_chest = sum_chest + excluded.sum_chest,
+        sum_gravel = sum_gravel + excluded.sum_gravel,
+        sum_belly = sum_belly + excluded.sum_belly,
+        sum_alpha = sum_alpha + excluded.sum_alpha,
+        max_alpha = MAX(COALESCE(max_alpha, excluded.max_alpha),
+                        COALESCE(excluded.max_alpha, max_alpha));
+
+    INSERT INTO daily_totals VALUES (
+        NEW.user, date(NEW.ts, 'unixepoch'), 1,
+        COALESCE(NEW.sub100, 0), COALESCE(NEW.chest, 0), COALESCE(NEW.gravel, 0),
+        COALESCE(NEW.belly, 0), COALESCE(NEW.alpha, 0), NEW.alpha
+    )
+    ON CONFLICT (user, day) DO UPDATE SET
+        n = n + 1,
+        sum_sub100 = sum_sub100 + excluded.sum_sub100,
+        sum_chest = sum_chest + excluded.sum_chest,
+        sum_gravel = sum_gravel + excluded.sum_gravel,
+        sum_belly = sum_belly + excluded.sum_belly,
+        sum_alpha = sum_alpha + excluded.sum_alpha,
+        max_alpha = MAX(COALESCE(max_alpha, excluded.max_alpha),
+                        COALESCE(excluded.max_alpha, max_alpha));
+END;
+"""
+
+# Rebuilds the totals for rows written before the trigger existed
+_REBUILD_TOTALS = """
+DELETE FROM user_totals;
+DELETE FROM daily_totals;
+
+INSERT INTO user_totals
+SELECT user, COUNT(*),
+       TOTAL(sub100), TOTAL(chest), TOTAL(gravel), TOTAL(belly), TOTAL(alpha),
+       MAX(alpha)
+FROM attempts WHERE passed GROUP BY user;
+
+INSERT INTO daily_totals
+SELECT user, date(ts, 'unixepoch'), COUNT(*),
+       TOTAL(sub100), TOTAL(chest), TOTAL(gravel), TOTAL(belly), TOTAL(alpha),
+       MAX(alpha)
+FROM attempts WHERE passed GROUP BY user, date(ts, 'unixepoch');
+
+INSERT OR REPLACE INTO meta (key, value) VALUES ('totals_version', '1');
+"""
+
+
+class ProgressStore:
+
+    def __init__(self, path=DB_PATH, legacy_json=LEGACY_JSON_PATH):
+        self.path = path
+        self._local = threading.local()
+
+        conn = self._conn()
+        self._add_passed_column()
+        with conn:
+            conn.executescript(_SCHEMA)
+            # schedules briefly kept under throwaway per-session ids
+            conn.execute("DELETE FROM drill_state WHERE user >= 'session-' AND user < 'session.'")
+        self._ensure_totals()
+        self._migrate_legacy_json(legacy_json)
+
+    def _conn(self):
+        # sqlite3 connections are per thread; Streamlit runs each
+        # session on its own script thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # ------------------------------------------------------
+    # 📝 WRITES
+    # ------------------------------------------------------
+    def _row(self, entry, user):
+        extra = {k: v for k, v in entry.items()
+                 if k not in METRIC_COLUMNS and k not in ("word", "timestamp", "user")}
+        return (
+            user,
+            entry.get("word"),
+            float(entry.get("timestamp") or 0),
+            *(entry.get(m) for m in METRIC_COLUMNS),
+            json.dumps(extra) if extra else None,
+        )
+
+    def record_attempt(self, entry, user=DEFAULT_USER, passed=True):
+        # entry: score dict + "word" + "timestamp" (as built by the drills)
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "INSERT INTO attempts (user, word, ts, sub100, chest, gravel, belly, alpha, extra, passed)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (*self._row(entry, user), int(bool(passed)))
+            )
+
+    def _add_passed_column(self):
+        # Databases from before `passed` held passed takes only: add the
+        # column (default 1) and drop the old trigger so _SCHEMA
+        # recreates it with the WHEN clause
+        conn = self._conn()
+        cols = [r[1] for r in conn.execute("PRAGMA table_info(attempts)")]
+        if cols and "passed" not in cols:
+            with conn:
+                conn.execute("ALTER TABLE attempts ADD COLUMN passed INTEGER NOT NULL DEFAULT 1")
+                conn.execute("DROP TRIGGER IF EXISTS attempts_totals")
+
+    def save_drill_state(self, deck, item, word, deficit, streak, last_seen, due,
+                         user=DEFAULT_USER):
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO drill_state"
+                " (user, deck, item, word, deficit, streak, last_seen, due)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (user, deck, item, word, deficit, streak, last_seen, due)
+            )
+
+    def _ensure_totals(self):
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if conn.execute("SELECT 1 FROM meta WHERE key = 'totals_version'").fetchone() is None:
+                for stmt in _REBUILD_TOTALS.strip().split(";\n"):
+                    conn.execute(stmt)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    def _migrate_legacy_json(self, legacy_json):
+        if not legacy_json or not os.path.exists(legacy_json):
+            return
+
+        conn = self._conn()
+        key = f"migrated:{os.path.abspath(legacy_json)}"
+
+        # IMMEDIATE takes the write lock up front, so two server
+        # processes starting together cannot both import the file
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if conn.execute("SELECT 1 FROM meta WHERE key = ?", (key,)).fetchone() is None:
+                with open(legacy_json, "r") as f:
+                    entries = json.load(f)
+
+                conn.executemany(
+                    "INSERT INTO attempts (user, word, ts, sub100, chest, gravel, belly, alpha, extra)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [self._row(e, e.get("user", DEFAULT_USER)) for e in entries]
+                )
+                conn.execute("INSERT INTO meta (key, value) VALUES (?, ?)",
+                             (key, str(len(entries))))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    # ------------------------------------------------------
+    # 🔎 READS
+    # ------------------------------------------------------
+    def history(self, user=DEFAULT_USER, word=None, since=None, until=None, limit=None,
+                passed=True):
+        # -> list of dicts in time order, same keys the drills saved;
+        #    passed=None includes failed takes
+        sql = ("SELECT word, ts AS timestamp, sub100, chest, gravel, belly, alpha"
+               " FROM attempts WHERE user = ?")
+        args = [user]
+
+        if passed is not None:
+            sql += " AND passed = ?"
+            args.append(int(bool(passed)))
+        if word is not None:
+            sql += " AND word = ?"
+            args.append(word)
+        if since is not None:
+            sql += " AND ts >= ?"
+            args.append(since)
+        if until is not None:
+            sql += " AND ts < ?"
+            args.append(until)
+
+        sql += " ORDER BY ts"
+        if limit is not None:
+            # newest `limit` rows, still returned oldest first
+            sql = f"SELECT * FROM ({sql} DESC LIMIT ?) ORDER BY timestamp"
+            args.append(limit)
+
+        rows = self._conn().execute(sql, args).fetchall()
+        return [dict(r) for r in rows]
+
+    def drill_states(self, deck, user=DEFAULT_USER):
+        # -> [(item, word, deficit, streak, last_seen, due), ...]
+        return [tuple(r) for r in self._conn().execute(
+            "SELECT item, word, deficit, streak, last_seen, due"
+            " FROM drill_state WHERE user = ? AND deck = ?", (user, deck)
+        ).fetchall()]
+
+    def count(self, user=DEFAULT_USER):
+        row = self._conn().execute(
+            "SELECT n FROM user_totals WHERE user = ?", (user,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    # ------------------------------------------------------
+    # ⚡ AGGREGATES (O(1) — read from the running totals)
+    # ------------------------------------------------------
+    def summary(self, user=DEFAULT_USER):
+        # -> {"count", "avg_alpha", "max_alpha", "avg": {metric: mean}}
+        #    or None when the user has no attempts yet
+        row = self._conn().execute(
+            "SELECT * FROM user_totals WHERE user = ?", (user,)
+        ).fetchone()
+
+        if row is None or row["n"] == 0:
+            return None
+
+        n = row["n"]
+        return {
+            "count": n,
+            "avg_alpha": row["sum_alpha"] / n,
+            "max_alpha": row["max_alpha"],
+            "avg": {m: row[f"sum_{m}"] / n for m in METRIC_COLUMNS},
+        }
+
+    def daily_timeline(self, user=DEFAULT_USER):
+        # -> one row per training day: attempts and per-metric means
+        rows = self._conn().execute(
+            "SELECT * FROM daily_totals WHERE user = ? ORDER BY day", (user,)
+        ).fetchall()
+
+        return [
+            {
+                "day": r["day"],
+                "attempts": r["n"],
+                "max_alpha": r["max_alpha"],
+                **{m: r[f"sum_{m}"] / r["n"] for m in METRIC_COLUMNS},
+            }
+            for r in rows
+        ]
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_progress_store():
+    global _store
+
+    with _store_lock:
+        if _store is None:
+            _store = ProgressStore()
+        return _store
@@ -0,0 +1,437 @@
+# ==========================================================
+# 🎛 RESONANCE DSP CORE
+# Shared band filterbank for voice_engine + live_stream
+# ==========================================================
+
+from functools import lru_cache
+
+import numpy as np
+
+
+# numpy >= 2.0 can write FFT output into a caller-owned buffer
+_RFFT_HAS_OUT = np.lib.NumpyVersion(np.__version__) >= "2.0.0"
+
+
+# ----------------------------------------------------------
+# 🎯 BAND TABLES  (name, low_hz, high_hz) — inclusive edges
+# ----------------------------------------------------------
+# Voice Lab / drills (voice_engine.analyze_mic_input)
+LAB_BANDS = (
+    ("sub100", 50, 95),
+    ("chest", 150, 350),
+    ("gravel", 3000, 5500),
+    ("belly", 20, 60),
+)
+
+# Live browser stream (live_stream.AlphaResonanceProcessor)
+LIVE_BANDS = (
+    ("sub100", 50, 95),
+    ("chest", 120, 300),
+    ("belly", 20, 60),
+    ("gravel", 2500, 5000),
+)
+
+
+# ----------------------------------------------------------
+# 📋 SCORING PROFILES
+# ----------------------------------------------------------
+# bands  — band table above
+# gain   — per-band multiplier on (band energy / total energy),
+#          capped at 100
+# alpha  — weighted sum of the capped scores, applied in this order.
+#          Names that are not bands (e.g. "vibration") are extra
+#          features the caller supplies per frame.
+LAB_PROFILE = {
+    "bands": LAB_BANDS,
+    "gain": {"sub100": 2500, "chest": 1500, "gravel": 3000, "belly": 4000},
+    "alpha": {"sub100": 0.5, "chest": 0.3, "gravel": 0.2},
+}
+
+LIVE_PROFILE = {
+    "bands": LIVE_BANDS,
+    "gain": {"sub100": 2500, "chest": 1700, "belly": 4200, "gravel": 2600},
+    "alpha": {"sub100": 0.40, "chest": 0.30, "vibration": 0.20, "gravel": 0.10},
+}
+
+PROFILES = {
+    "lab": LAB_PROFILE,
+    "live": LIVE_PROFILE,
+}
+
+
+# ----------------------------------------------------------
+# 🎼 PITCH RANGE
+# ----------------------------------------------------------
+# F0 search range (Hz) — covers deep bass through a raised male voice
+PITCH_FMIN = 60
+PITCH_FMAX = 400
+
+# Pitch score: 100 at or below DEEP, falling linearly to 0 at HIGH
+PITCH_DEEP_HZ = 85
+PITCH_HIGH_HZ = 200
+
+# Normalized autocorrelation peak needed to call a frame voiced
+PITCH_VOICING = 0.5
+
+# Only spectrum below this feeds the autocorrelation: F0 and its first
+# harmonics are all there, and the inverse FFT shrinks ~8x
+PITCH_SPECTRUM_HZ = 3000
+
+
+# ----------------------------------------------------------
+# 🧮 FILTERBANK
+# ----------------------------------------------------------
+class BandFilterbank:
+
+    # rfftfreq is sorted, so every (freqs >= lo) & (freqs <= hi) mask
+    # is one contiguous bin range. We keep only the [start, stop) edges;
+    # ResonanceScorer.zones reduces all zones with a single prefix sum
+    # per spectrum.
+
+    def __init__(self, sample_rate, n_samples, bands):
+        freqs = np.fft.rfftfreq(n_samples, 1 / sample_rate)
+
+        lows = np.array([b[1] for b in bands], dtype=np.float64)
+        highs = np.array([b[2] for b in bands], dtype=np.float64)
+
+        self.sample_rate = sample_rate
+        self.n_samples = n_samples
+        self.n_bins = len(freqs)
+        self.names = tuple(b[0] for b in bands)
+        self.starts = np.searchsorted(freqs, lows, side="left")
+        self.stops = np.searchsorted(freqs, highs, side="right")
+
+
+@lru_cache(maxsize=64)
+def get_filterbank(sample_rate, n_samples, bands):
+    return BandFilterbank(sample_rate, n_samples, bands)
+
+
+# ----------------------------------------------------------
+# 🔥 SCORING KERNEL
+# ----------------------------------------------------------
+class ResonanceScorer:
+
+    # One FFT -> band -> score pipeline for every caller.
+    #
+    #   zones, totals = scorer.zones(frames)          # FFT + filterbank
+    #   scores, alpha = scorer.score_zones(zones, totals, extra)
+    #
+    # frames may be 1-D (n_samples,) or 2-D (batch, n_samples). All
+    # work happens in buffers preallocated for `max_batch` rows (grown
+    # once if a bigger batch shows up), so the steady state allocates
+    # nothing. Returned arrays are views into those buffers: consume
+    # them before the next call. Not thread-safe — one per session.
+
+    def __init__(self, profile, sample_rate, n_samples, taper=False, max_batch=1):
+        self.profile = profile
+        self.sample_rate = sample_rate
+        self.n_samples = n_samples
+        self.bank = get_filterbank(sample_rate, n_samples, profile["bands"])
+
+        bands = self.bank.names
+        extras = tuple(k for k in profile["alpha"] if k not in bands)
+
+        self.features = bands + extras
+        self.n_bands = len(bands)
+
+        self._gain = np.array([profile["gain"][b] for b in bands], dtype=np.float64)
+        self._alpha_terms = [(self.features.index(k), w)
+                             for k, w in profile["alpha"].items()]
+        self._taper = np.hanning(n_samples) if taper else None
+
+        self._alloc(max_batch)
+
+    def _alloc(self, batch):
+        n_bins = self.bank.n_bins
+
+        self._capacity = batch
+        self._frames = np.empty((batch, self.n_samples))
+        self._spec = np.empty((batch, n_bins), dtype=np.complex128)
+        self._mag = np.empty((batch, n_bins))
+        self._csum = np.zeros((batch, n_bins + 1))
+        self._lo = np.empty((batch, self.n_bands))
+        self._hi = np.empty((batch, self.n_bands))
+        self._zones = np.empty((batch, self.n_bands))
+        self._denom = np.empty((batch, 1))
+        self._scores = np.empty((batch, len(self.features)))
+        self._alpha = np.empty(batch)
+        self._term = np.empty(batch)
+
+    def zones(self, frames):
+        single = frames.ndim == 1
+        x = frames.reshape(1, -1) if single else frames
+        b = x.shape[0]
+
+        if b > self._capacity:
+            self._alloc(b)
+
+        f = self._frames[:b]
+        if self._taper is not None:
+            np.multiply(x, self._taper, out=f)
+        else:
+            np.copyto(f, x)
+
+        spec = self._spec[:b]
+        if _RFFT_HAS_OUT:
+            np.fft.rfft(f, axis=-1, out=spec)
+        else:
+            spec[...] = np.fft.rfft(f, axis=-1)
+
+        mag = np.abs(spec, out=self._mag[:b])
+
+        # prefix sum -> every band is hi - lo (see BandFilterbank)
+        csum = self._csum[:b]
+        np.cumsum(mag, axis=-1, out=csum[:, 1:])
+
+        lo = np.take(csum, self.bank.starts, axis=-1, out=self._lo[:b])
+        hi = np.take(csum, self.bank.stops, axis=-1, out=self._hi[:b])
+        zones = np.subtract(hi, lo, out=self._zones[:b])
+        totals = csum[:, -1]
+
+        if single:
+            return zones[0], totals[0]
+        return zones, totals
+
+    def magnitude(self, b=1):
+        # |rfft| of the last zones() call — view, same lifetime rules
+        return self._mag[:b]
+
+    def score_zones(self, zones, totals, extra=None):
+        single = np.ndim(zones) == 1
+        z = np.reshape(zones, (-1, self.n_bands))
+        b = z.shape[0]
+
+        if b > self._capacity:
+            self._alloc(b)
+
+        scores = self._scores[:b]
+        band_scores = scores[:, :self.n_bands]
+
+        denom = self._denom[:b]
+        denom[:, 0] = totals
+        denom += 1e-10
+
+        np.divide(z, denom, out=band_scores)
+        np.multiply(band_scores, self._gain, out=band_scores)
+        np.trunc(band_scores, out=band_scores)
+        np.minimum(band_scores, 100, out=band_scores)
+
+        for i, name in enumerate(self.features[self.n_bands:]):
+            scores[:, self.n_bands + i] = extra[name]
+
+        # left-to-right weighted sum, same rounding as int(a*w1 + b*w2 ...)
+        alpha = self._alpha[:b]
+        term = self._term[:b]
+        alpha.fill(0.0)
+        for col, weight in self._alpha_terms:
+            np.multiply(scores[:, col], weight, out=term)
+            alpha += term
+        np.trunc(alpha, out=alpha)
+
+        if single:
+            return scores[0], alpha[0]
+        return scores, alpha
+
+    def to_dict(self, scores, alpha):
+        # one scored row -> {"sub100": 87, ..., "alpha": 74}
+        res = dict(zip(self.features, (int(v) for v in scores)))
+        res["alpha"] = int(alpha)
+        return res
+
+
+# ----------------------------------------------------------
+# 🎼 PITCH (F0) TRACKER
+# ----------------------------------------------------------
+class PitchTracker:
+
+    # FFT autocorrelation F0 on the same frames the scorer analyses.
+    # It reuses the scorer's magnitude spectrum (Wiener–Khinchin:
+    # irfft(|X|^2) is the autocorrelation). Only the bins below
+    # PITCH_SPECTRUM_HZ are kept, so each hop costs one small irfft
+    # (512 points for 4096 @ 48 kHz) — bounded, whatever the voice.
+    #
+    #   f0, clarity = tracker.from_magnitude(scorer.magnitude(b))
+    #
+    # The autocorrelation is divided by the taper's own so that Hann
+    # windowing does not bias toward short lags. The first local peak
+    # within 90% of the best one wins, which avoids octave-down picks.
+    # f0 is 0 where the frame is not voiced (clarity < PITCH_VOICING).
+
+    def __init__(self, sample_rate, n_samples, tapered=True,
+                 fmin=PITCH_FMIN, fmax=PITCH_FMAX):
+        self.sample_rate = sample_rate
+        self.n_samples = n_samples
+
+        # band-limited autocorrelation: n_acf points at acf_rate
+        want = 2 * PITCH_SPECTRUM_HZ * n_samples / sample_rate
+        self.n_acf = min(n_samples, 1 << int(np.ceil(np.log2(max(want, 8)))))
+        self.n_keep = self.n_acf // 2 + 1
+        self.acf_rate = sample_rate * self.n_acf / n_samples
+
+        self.lag_lo = max(2, int(self.acf_rate // fmax))
+        self.lag_hi = min(int(np.ceil(self.acf_rate / fmin)), self.n_acf // 2 - 2)
+
+        taper = np.hanning(n_samples) if tapered else np.ones(n_samples)
+        self.taper = taper if tapered else None
+        w_mag = np.abs(np.fft.rfft(taper))[:self.n_keep]
+        w_acf = np.fft.irfft(w_mag * w_mag, n=self.n_acf)
+        self._inv_w_acf = w_acf[0] / w_acf[:self.lag_hi + 2]
+        self._lags = np.arange(self.lag_lo, self.lag_hi + 1)
+
+    def from_magnitude(self, mag):
+        single = mag.ndim == 1
+        m = (mag.reshape(1, -1) if single else mag)[:, :self.n_keep]
+
+        acf = np.fft.irfft(m * m, n=self.n_acf, axis=-1)[:, :self.lag_hi + 2]
+        acf *= self._inv_w_acf
+
+        # peak picking is scale-free: normalize only the chosen values
+        seg = acf[:, self.lag_lo:self.lag_hi + 1]
+        left = acf[:, self.lag_lo - 1:self.lag_hi]
+        right = acf[:, self.lag_lo + 1:self.lag_hi + 2]
+
+        best = seg.max(axis=-1, keepdims=True)
+        peaks = (seg >= left) & (seg >= right) & (seg >= 0.9 * best)
+        idx = np.argmax(peaks, axis=-1)
+
+        if single:
+            i = int(idx[0])
+            energy = float(acf[0, 0])
+            if not peaks[0, i] or energy <= 0:
+                return 0.0, 0.0
+            c, l, r = float(seg[0, i]), float(left[0, i]), float(right[0, i])
+            curve = l - 2 * c + r
+            lag = (self.lag_lo + i) + (0.5 * (l - r) / curve if curve < 0 else 0.0)
+            clarity = min(1.0, max(0.0, c / energy))
+            return (self.acf_rate / lag if clarity >= PITCH_VOICING else 0.0), clarity
+
+        rows = np.arange(len(seg))
+        energy = acf[:, 0]
+        c = seg[rows, idx]
+        l = left[rows, idx]
+        r = right[rows, idx]
+
+        # parabolic interpolation around the chosen lag
+        curve = l - 2 * c + r
+        shift = np.where(curve < 0, 0.5 * (l - r) / np.where(curve < 0, curve, -1.0), 0.0)
+        lag = self._lags[idx] + shift
+
+        clarity = np.clip(c / np.where(energy > 0, energy, np.inf), 0.0, 1.0)
+        voiced = peaks[rows, idx] & (clarity >= PITCH_VOICING)
+        f0 = np.where(voiced, self.acf_rate / lag, 0.0)
+        return f0, clarity
+
+    def track(self, frames):
+        # raw (untapered) frames, for callers without a scorer
+        if self.taper is not None:
+            frames = frames * self.taper
+        return self.from_magnitude(np.abs(np.fft.rfft(frames, axis=-1)))
+
+
+@lru_cache(maxsize=16)
+def get_pitch_tracker(sample_rate, n_samples, tapered=True):
+    # stateless — safe to share between sessions and threads
+    return PitchTracker(sample_rate, n_samples, tapered)
+
+
+def pitch_score(f0):
+    # deeper = higher score; 0 for unvoiced (f0 == 0)
+    if np.ndim(f0) == 0:
+        # per-hop scalar: plain arithmetic beats np.interp's overhead
+        if f0 <= 0:
+            return 0.0
+        frac = (PITCH_HIGH_HZ - f0) / (PITCH_HIGH_HZ - PITCH_DEEP_HZ)
+        return float(int(100.0 * min(1.0, max(0.0, frac))))
+
+    s = np.interp(f0, (PITCH_DEEP_HZ, PITCH_HIGH_HZ), (100.0, 0.0))
+    return np.where(np.asarray(f0) > 0, np.trunc(s), 0.0)
+
+
+# ----------------------------------------------------------
+# 🔁 STFT RING BUFFER
+# ----------------------------------------------------------
+class StftRingBuffer:
+
+    # Collects arbitrary-sized audio chunks and hands out one
+    # Hann-windowed frame of `window` samples every `hop` samples.
+    # Every sample is written twice (at i and i + window) so the latest
+    # window is always one contiguous slice — no copies, no np.roll.
+
+    def __init__(self, window=4096, hop=1024):
+        if not 0 < hop <= window:
+            raise ValueError("hop must be in (0, window]")
+
+        self.window = window
+        self.hop = hop
+
+        self._buf = np.zeros(2 * window, dtype=np.float32)
+        self._taper = np.hanning(window).astype(np.float32)
+        self._frame = np.empty(window, dtype=np.float32)
+        self._pos = 0
+        self._filled = 0
+        self._since_hop = 0
+
+    @property
+    def raw(self):
+        # un-tapered view of the latest window (oldest sample first)
+        return self._buf[self._pos:self._pos + self.window]
+
+    def _write(self, chunk):
+        n = len(chunk)
+        w = self.window
+        pos = self._pos
+
+        first = min(n, w - pos)
+        self._buf[pos:pos + first] = chunk[:first]
+        self._buf[pos + w:pos + w + first] = chunk[:first]
+
+        rest = n - first
+        if rest:
+            self._buf[:rest] = chunk[first:]
+            self._buf[w:w + rest] = chunk[first:]
+
+        self._pos = (pos + n) % w
+        self._filled = min(w, self._filled + n)
+
+    def push(self, samples, emit=True):
+        # Generator: yields the tapered frame once per completed hop.
+        # The yielded array is reused — consume it before advancing.
+        i = 0
+        while i < len(samples):
+            take = min(self.hop - self._since_hop, len(samples) - i)
+            self._write(samples[i:i + take])
+            self._since_hop += take
+            i += take
+
+            if self._since_hop == self.hop:
+                self._since_hop = 0
+                if emit and self._filled == self.window:
+                    np.multiply(self.raw, self._taper, out=self._frame)
+                    yield self._frame
+
+    def write(self, samples):
+        # Same bookkeeping as push(), no taper and nothing yielded — for
+        # chunks the caller has decided not to analyse (VAD gated)
+        for _ in self.push(samples, emit=False):
+            pass
+
+
+# ----------------------------------------------------------
+# 🔀 CHANNEL DOWNMIX
+# ----------------------------------------------------------
+def downmix_s16(pcm, channels):
+    # interleaved int16 (n * channels,) -> mono int16 (n,), channels averaged
+    if channels <= 1:
+        return pcm
+    return (pcm.reshape(-1, channels).sum(axis=1, dtype=np.int32) // channels).astype(np.int16)
+
+
+def frame_to_mono(frame):
+    # av.AudioFrame -> mono int16. aiortc delivers packed (interleaved)
+    # stereo s16, which ravel() alone would hand on as mono at twice
+    # the length — every sample twice, every frequency halved
+    data = frame.to_ndarray()
+    channels = len(frame.layout.channels)
+    interleaved = data.T.ravel() if frame.format.is_planar else data.ravel()
+    return downmix_s16(interleaved, channels)
@@ -0,0 +1,130 @@
+# ==========================================================
+# 📼 PER-SESSION RESULT HISTORY
+# Fixed-size ring of per-hop scores + vectorized smoothing
+# ==========================================================
+#
+# The analysis side appends one row per scored hop (full resolution);
+# the UI reads smoothed values / summaries at whatever rate it likes
+# instead of sampling a single latest_result.
+#
+#   hist = ResultHistory(("sub100", "chest", ..., "alpha"))
+#   hist.append(scores, alpha, pitch, f0)
+#   hist.ema(seconds=1.0)          -> per-field smoothed values
+#   hist.summary(seconds=5.0)      -> {field: {"mean", "p90", "stability"}}
+#
+# Like StftRingBuffer every row is written twice (at i and
+# i + capacity), so the last n rows are always one contiguous view —
+# readers never copy. One writer (the analysis thread); readers may
+# run concurrently and at worst see the oldest row being replaced.
+
+import time
+from functools import lru_cache
+
+import numpy as np
+
+
+# ~10 s of live hops (48 kHz / 1024) or ~20 s of mic hops
+HISTORY_CAPACITY = 512
+
+# EMA half-life in rows (≈ 170 ms of live hops)
+EMA_HALFLIFE = 8
+
+
+@lru_cache(maxsize=64)
+def _ema_weights(n, halflife):
+    # normalized weights, newest row last: sum(w) == 1
+    decay = 0.5 ** (1.0 / halflife)
+    w = decay ** np.arange(n - 1, -1, -1, dtype=np.float64)
+    w /= w.sum()
+    w.flags.writeable = False
+    return w
+
+
+class ResultHistory:
+
+    def __init__(self, fields, capacity=HISTORY_CAPACITY):
+        self.fields = tuple(fields)
+        self.capacity = capacity
+
+        self._values = np.zeros((2 * capacity, len(self.fields)), dtype=np.float32)
+        self._ts = np.zeros(2 * capacity, dtype=np.float64)
+        # (next write slot, rows held) — swapped as one reference
+        self._state = (0, 0)
+
+    def __len__(self):
+        return self._state[1]
+
+    def append(self, scores, *tail, ts=None):
+        # scores: leading fields; tail: scalars for the fields after them
+        pos, count = self._state
+        row = self._values[pos]
+        k = len(scores)
+        row[:k] = scores
+        if tail:
+            row[k:] = tail
+        self._values[pos + self.capacity] = row
+
+        t = time.time() if ts is None else ts
+        self._ts[pos] = self._ts[pos + self.capacity] = t
+
+        self._state = ((pos + 1) % self.capacity, min(self.capacity, count + 1))
+
+    def clear(self):
+        self._state = (0, 0)
+
+    # ------------------------------------------------------
+    # 🔎 VIEWS (no copies)
+    # ------------------------------------------------------
+    def last(self, n=None, seconds=None):
+        # -> (ts, values) views over the newest rows, oldest first
+        pos, count = self._state
+        n = count if n is None else min(n, count)
+
+        end = pos + self.capacity
+        ts = self._ts[end - n:end]
+        values = self._values[end - n:end]
+
+        if seconds is not None and n:
+            first = np.searchsorted(ts, ts[-1] - seconds, side="left")
+            ts, values = ts[first:], values[first:]
+        return ts, values
+
+    def column(self, field, n=None, seconds=None):
+        return self.last(n, seconds)[1][:, self.fields.index(field)]
+
+    # ------------------------------------------------------
+    # 🌊 SMOOTHING / STATS (all fields at once)
+    # ------------------------------------------------------
+    def ema(self, n=None, seconds=None, halflife=EMA_HALFLIFE):
+        _, values = self.last(n, seconds)
+        if not len(values):
+            return None
+        return _ema_weights(len(values), halflife) @ values
+
+    def median(self, n=None, seconds=None):
+        _, values = self.last(n, seconds)
+        if not len(values):
+            return None
+        return np.median(values, axis=0)
+
+    def summary(self, n=None, seconds=None):
+        # -> {field: {"mean", "p90", "stability"}} or None when empty.
+        # stability: 100 = perfectly steady, 0 = spread as large as
+        # the mean (100 * (1 - std / mean), clipped)
+        _, values = self.last(n, seconds)
+        if not len(values):
+            return None
+
+        mean = values.mean(axis=0, dtype=np.float64)
+        p90 = np.percentile(values, 90, axis=0)
+        std = values.std(axis=0, dtype=np.float64)
+        stability = np.clip(100 * (1 - std / np.maximum(mean, 1e-9)), 0, 100)
+
+        return {
+            f: {"mean": float(mean[i]), "p90": float(p90[i]), "stability": float(stability[i])}
+            for i, f in enumerate(self.fields)
+        }
+
+    def as_dict(self, values):
+        # smoothed row -> {"sub100": 87, ..., "alpha": 74}
+        return {f: int(round(float(v))) for f, v in zip(self.fields, values)}
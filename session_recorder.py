@@ -0,0 +1,224 @@
+# ==========================================================
+# 💾 SESSION AUDIO RECORDER (opt-in)
+# Per-session PCM capture, spilled to disk off the media thread
+# ==========================================================
+#
+#   ALPHA_RECORD_AUDIO=1     record every live session
+#
+# recv() copies each frame — downmixed to mono when WebRTC delivers
+# interleaved stereo — into a preallocated int16 slab of
+# SEGMENT_SECONDS chunks (BUFFER_SECONDS per session, hard cap). Full
+# chunks go to one process-wide writer thread which stores them as
+# mono 16-bit WAV segments:
+#
+#   recordings/<session>/<seq>_<start_ms>_<word>.wav
+#
+# and appends a line to recordings/index.jsonl (session, word, ts,
+# path, sample_rate, samples). WAV data is raw int16 after a 44-byte
+# header, so offline tools can np.memmap it (open_segment) or re-score
+# it with `python batch_scoring.py recordings/`.
+#
+# The media thread never waits: when the writer falls behind and every
+# chunk is in flight, incoming audio is dropped and counted instead.
+
+import json
+import os
+import queue
+import re
+import sys
+import threading
+import time
+import uuid
+import wave
+from collections import deque
+
+import numpy as np
+
+from instrumentation import METRICS, incr
+from resonance_dsp import downmix_s16
+
+
+RECORD_AUDIO = os.getenv("ALPHA_RECORD_AUDIO", "0") == "1"
+
+RECORDINGS_ROOT = "recordings"
+INDEX_FILE = "index.jsonl"
+
+SEGMENT_SECONDS = 5
+BUFFER_SECONDS = 20      # per-session memory cap (~1.9 MB at 48 kHz)
+
+WAV_HEADER_BYTES = 44
+
+
+def _slug(text):
+    return re.sub(r"[^A-Za-z0-9]+", "-", text or "").strip("-")[:40] or "session"
+
+
+# ----------------------------------------------------------
+# ✍️ BACKGROUND WRITER (one per process)
+# ----------------------------------------------------------
+_jobs = queue.Queue()
+_writer = None
+_writer_lock = threading.Lock()
+_index_lock = threading.Lock()
+
+
+def _write_segment(job):
+    rec, slot, samples, started, label, seq = job
+    try:
+        folder = os.path.join(rec.root, rec.session_id)
+        os.makedirs(folder, exist_ok=True)
+
+        name = f"{seq:05d}_{int(started * 1000)}_{_slug(label)}.wav"
+        path = os.path.join(folder, name)
+
+        with wave.open(path, "wb") as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(rec.sample_rate)
+            w.writeframes(rec._slab[slot, :samples].tobytes())
+
+        entry = {
+            "session": rec.session_id,
+            "word": label,
+            "ts": started,
+            "path": os.path.relpath(path, rec.root),
+            "sample_rate": rec.sample_rate,
+            "samples": int(samples),
+        }
+        with _index_lock:
+            with open(os.path.join(rec.root, INDEX_FILE), "a") as f:
+                f.write(json.dumps(entry) + "\n")
+    except Exception as e:
+        # any failure costs this segment only — the writer thread and
+        # every other session's recording carry on
+        rec.failed_segments += 1
+        print(f"recorder: segment {rec.session_id}/{seq} not written: {e!r}", file=sys.stderr)
+        if METRICS:
+            incr("recording_segments_failed")
+    finally:
+        # chunk is free for the media thread again
+        rec._free.append(slot)
+
+
+def _writer_loop():
+    while True:
+        _write_segment(_jobs.get())
+
+
+def _ensure_writer():
+    global _writer
+
+    with _writer_lock:
+        if _writer is None:
+            _writer = threading.Thread(target=_writer_loop, name="alpha-recorder", daemon=True)
+            _writer.start()
+
+
+# ----------------------------------------------------------
+# 🎙 PER-SESSION RECORDER
+# ----------------------------------------------------------
+class SessionRecorder:
+
+    # write / close run on the media thread; set_label may be called
+    # from the page (a single attribute store). The writer thread only
+    # touches the slab rows it was handed.
+
+    def __init__(self, sample_rate, session_id=None, root=RECORDINGS_ROOT,
+                 segment_seconds=SEGMENT_SECONDS, buffer_seconds=BUFFER_SECONDS):
+        self.sample_rate = sample_rate
+        self.session_id = session_id or uuid.uuid4().hex[:12]
+        self.root = root
+
+        self.segment = int(segment_seconds * sample_rate)
+        n_chunks = max(2, int(buffer_seconds // segment_seconds))
+        self._slab = np.empty((n_chunks, self.segment), dtype=np.int16)
+        self._free = deque(range(n_chunks))
+
+        self._slot = None
+        self._fill = 0
+        self._started = 0.0
+        self._label = ""
+        self._pending_label = ""
+        self._seq = 0
+
+        self.dropped_samples = 0
+        self.failed_segments = 0
+
+        _ensure_writer()
+
+    def set_label(self, label):
+        # e.g. the word / sentence on screen; takes effect at the next
+        # write and starts a new segment
+        self._pending_label = label or ""
+
+    def _hand_off(self):
+        if self._slot is not None and self._fill:
+            _jobs.put((self, self._slot, self._fill, self._started, self._label, self._seq))
+            self._seq += 1
+        elif self._slot is not None:
+            self._free.append(self._slot)
+        self._slot = None
+        self._fill = 0
+
+    def write(self, pcm, channels=1):
+        # pcm: interleaved int16 samples (what the WebRTC frame carries);
+        # multi-channel frames are averaged down to mono
+        pcm = downmix_s16(pcm, channels)
+
+        if self._pending_label != self._label:
+            self._hand_off()
+            self._label = self._pending_label
+
+        i = 0
+        n = len(pcm)
+        while i < n:
+            if self._slot is None:
+                try:
+                    self._slot = self._free.popleft()
+                except IndexError:
+                    # writer is behind and the cap is reached — drop
+                    self.dropped_samples += n - i
+                    if METRICS:
+                        incr("recording_samples_dropped", n - i)
+                    return
+                self._fill = 0
+                self._started = time.time() - (n - i) / self.sample_rate
+
+            take = min(self.segment - self._fill, n - i)
+            self._slab[self._slot, self._fill:self._fill + take] = pcm[i:i + take]
+            self._fill += take
+            i += take
+
+            if self._fill == self.segment:
+                self._hand_off()
+
+    def close(self):
+        self._hand_off()
+
+
+# ----------------------------------------------------------
+# 📖 OFFLINE ACCESS
+# ----------------------------------------------------------
+def load_index(root=RECORDINGS_ROOT, session=None, word=None, since=None):
+    path = os.path.join(root, INDEX_FILE)
+    if not os.path.exists(path):
+        return []
+
+    entries = []
+    with open(path, "r") as f:
+        for line in f:
+            e = json.loads(line)
+            if session is not None and e["session"] != session:
+                continue
+            if word is not None and e["word"] != word:
+                continue
+            if since is not None and e["ts"] < since:
+                continue
+            entries.append(e)
+    return entries
+
+
+def open_segment(entry, root=RECORDINGS_ROOT):
+    # -> read-only int16 memmap of the segment's samples
+    return np.memmap(os.path.join(root, entry["path"]), dtype=np.int16, mode="r",
+                     offset=WAV_HEADER_BYTES, shape=(entry["samples"],))
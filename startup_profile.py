@@ -0,0 +1,125 @@
+# ==========================================================
+# ⏱ STARTUP IMPORT PROFILE
+# `python -X importtime` breakdown per page
+# ==========================================================
+#
+#   python startup_profile.py              # every page, top 8 imports
+#   python startup_profile.py --top 15 home_dashboard.py
+#   python startup_profile.py --json > startup.json
+#
+# Each page's module-level imports are replayed in a fresh interpreter
+# after app.py's own imports (the router is always loaded first), so a
+# page is charged only for what it adds on top. Imports deferred into
+# functions or `if` blocks are not counted — that is the point.
+
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+
+
+ROUTER = "app.py"
+PAGES = ("login.py", "home_dashboard.py", "pages")
+
+
+def _page_files(targets):
+    files = []
+    for t in targets:
+        if os.path.isdir(t):
+            files.extend(sorted(os.path.join(t, f) for f in os.listdir(t) if f.endswith(".py")))
+        else:
+            files.append(t)
+    return files
+
+
+def _eager_imports(path):
+    # top-level import statements (including ones wrapped in try:)
+    with open(path, "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+
+    nodes = []
+    for node in tree.body:
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            nodes.append(node)
+        elif isinstance(node, ast.Try):
+            nodes.extend(n for n in node.body if isinstance(n, (ast.Import, ast.ImportFrom)))
+
+    stmts = []
+    for node in nodes:
+        if isinstance(node, ast.Import):
+            stmts.extend(f"import {a.name}" for a in node.names)
+        elif node.level == 0:
+            stmts.append(f"import {node.module}")
+    return stmts
+
+
+def _importtime(stmts):
+    # -> [(module, self_us, cumulative_us, depth)] in import order
+    code = "\n".join(f"try:\n    {s}\nexcept Exception:\n    pass" for s in stmts) or "pass"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        name = parts[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(parts[0]), int(parts[1]), depth))
+    return rows
+
+
+def profile(files, router=ROUTER):
+    router_stmts = _eager_imports(router)
+    baseline = {name for name, *_ in _importtime(router_stmts)}
+
+    report = {}
+    for path in files:
+        rows = [r for r in _importtime(router_stmts + _eager_imports(path)) if r[0] not in baseline]
+        top = [r for r in rows if r[3] == 0]
+        report[path] = {
+            "total_ms": sum(r[2] for r in top) / 1000,
+            "modules": len(rows),
+            "top": [{"module": r[0], "cumulative_ms": r[2] / 1000}
+                    for r in sorted(top, key=lambda r: r[2], reverse=True)],
+        }
+
+    report[router] = {
+        "total_ms": sum(r[2] for r in _importtime(router_stmts) if r[3] == 0) / 1000,
+        "modules": len(baseline),
+        "top": [],
+    }
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-page import-time report.")
+    parser.add_argument("pages", nargs="*", default=list(PAGES))
+    parser.add_argument("--top", type=int, default=8)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    report = profile(_page_files(args.pages))
+
+    if args.json:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+        return
+
+    router = report.pop(ROUTER)
+    print(f"{ROUTER:<34} {router['total_ms']:8.1f} ms  ({router['modules']} modules, shared)")
+    for path, r in sorted(report.items(), key=lambda kv: kv[1]["total_ms"], reverse=True):
+        print(f"{path:<34} {r['total_ms']:8.1f} ms  (+{r['modules']} modules)")
+        for m in r["top"][:args.top]:
+            print(f"    {m['module']:<30} {m['cumulative_ms']:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+# ==========================================================
+# 🔬 THRESHOLD WHAT-IF
+# Re-judge every stored attempt under candidate pass rules at once
+# ==========================================================
+#
+#   python threshold_whatif.py                              # today's rule
+#   python threshold_whatif.py --thresholds 75:95:5 \
+#       --weights 0.5,0.3,0.2,0 0.4,0.3,0.2,0.1 --cert-sessions 5 7 10
+#   python threshold_whatif.py --thresholds 80,85,85,85,85 --per-user --out users.csv
+#
+# A candidate is a threshold vector (sub100, chest, gravel, belly,
+# alpha — the drills' `all(check[m] >= DRILL_PASS_SCORE)` rule) and an
+# alpha weight vector over (sub100, chest, gravel, belly). Under the current
+# LAB_PROFILE weights the stored alpha is used as is — the drills judge
+# the per-hop median alpha, which is not the weighted sum of the median
+# band scores — so today's rule replays the stored verdicts. Other
+# weights recompute alpha from the stored band scores the way
+# ResonanceScorer does (float64 `alpha += score * weight` left to
+# right, then trunc); that is an approximation of what the drills would
+# have judged. Certificates follow 3_Mastery_Certificate: a member qualifies
+# with at least `cert_sessions` passing attempts.
+#
+# All T thresholds x W weight vectors are judged in one broadcast per
+# chunk of attempts; per-member counts come from np.add.reduceat over
+# attempts pre-sorted by member, so memory is bounded by CHUNK, not by
+# the history size.
+#
+# Attempts come from the Parquet "progress" dataset when it is current
+# (history_columnar), else straight from progress.db. The drills store
+# every spoken take, passed or not, and rates are over all of them;
+# `stored_pass_rate` is the verdict the drills gave at the time.
+# (Rows from before the `passed` flag are passes only.)
+
+import argparse
+import csv
+import os
+import sqlite3
+import sys
+
+import numpy as np
+import pandas as pd
+
+from history_columnar import load_columns, PROGRESS_DATASET
+from progress_store import DB_PATH, METRIC_COLUMNS, ProgressStore
+from resonance_dsp import LAB_PROFILE
+
+
+# order of the stored band columns the alpha weights apply to — the
+# LAB_PROFILE["alpha"] order first, so the summation order matches
+ALPHA_INPUTS = ("sub100", "chest", "gravel", "belly")
+
+CURRENT_THRESHOLD = 85     # the drills' DRILL_PASS_SCORE
+CURRENT_WEIGHTS = tuple(LAB_PROFILE["alpha"].get(m, 0.0) for m in ALPHA_INPUTS)
+CURRENT_CERT_SESSIONS = 7
+
+# attempts judged per broadcast; (T, CHUNK, W) booleans at a time
+CHUNK = 65536
+
+# ----------------------------------------------------------
+# 📥 LOADING
+# ----------------------------------------------------------
+def load_attempts(db_path=DB_PATH):
+    # -> (user_names, codes, scores, stored): codes (N,) int32 sorted
+    #    ascending, scores (N, 5) uint8 in METRIC_COLUMNS order, stored
+    #    (N,) bool — the drills' own verdict; rows grouped by user
+    cols = ["user", *METRIC_COLUMNS, "passed"]
+    try:
+        df = load_columns(PROGRESS_DATASET, cols, source=db_path)
+    except ValueError:
+        # snapshot converted before the `passed` column existed
+        df = load_columns(PROGRESS_DATASET, cols[:-1], source=db_path)
+
+    if df is None:
+        if not os.path.exists(db_path):
+            return (np.array([], dtype=object), np.zeros(0, np.int32),
+                    np.zeros((0, 5), np.uint8), np.zeros(0, bool))
+        # opening through the store adds `passed` to older databases
+        ProgressStore(db_path, legacy_json=None)
+        with sqlite3.connect(db_path) as conn:
+            df = pd.read_sql_query(f"SELECT {', '.join(cols)} FROM attempts", conn)
+
+    codes, names = pd.factorize(df["user"].astype(str))
+    scores = df[list(METRIC_COLUMNS)].fillna(0).to_numpy(dtype=np.uint8)
+    stored = (df["passed"].fillna(1).to_numpy(dtype=bool) if "passed" in df
+              else np.ones(len(df), dtype=bool))
+
+    order = np.argsort(codes, kind="stable")
+    return (np.asarray(names, dtype=object), codes[order].astype(np.int32),
+            scores[order], stored[order])
+
+
+# ----------------------------------------------------------
+# 🧮 EVALUATION
+# ----------------------------------------------------------
+def evaluate(codes, scores, n_users, thresholds, weights, chunk=CHUNK):
+    # thresholds (T, 5), weights (W, 4) -> passes (T, W, n_users) int64
+    thresholds = np.asarray(thresholds, dtype=np.float64)
+    weights = np.asarray(weights, dtype=np.float64)
+    T, W = len(thresholds), len(weights)
+
+    passes = np.zeros((T, W, n_users), dtype=np.int64)
+    band_cols = [METRIC_COLUMNS.index(m) for m in ALPHA_INPUTS]
+    band_min = thresholds[:, None, band_cols]            # (T, 1, 4)
+    alpha_col = METRIC_COLUMNS.index("alpha")
+    alpha_min = thresholds[:, None, None, alpha_col]     # (T, 1, 1)
+
+    # the current weights keep the stored alpha; only the others recompute
+    stored = (weights == np.asarray(CURRENT_WEIGHTS)).all(axis=1)
+    changed = weights[~stored]
+
+    for start in range(0, len(codes), chunk):
+        c = codes[start:start + chunk]
+        bands = scores[start:start + chunk, band_cols].astype(np.float64)   # (n, 4)
+
+        alpha = np.empty((len(c), W))                               # (n, W)
+        alpha[:, stored] = scores[start:start + chunk, alpha_col, None]
+        if len(changed):
+            # same left-to-right sum as ResonanceScorer.score_zones
+            recomputed = np.zeros((len(c), len(changed)))
+            for j in range(len(ALPHA_INPUTS)):
+                recomputed += bands[:, j, None] * changed[:, j]
+            alpha[:, ~stored] = np.trunc(recomputed)
+        bands_ok = (bands[None] >= band_min).all(axis=-1)           # (T, n)
+        ok = bands_ok[:, :, None] & (alpha[None] >= alpha_min)      # (T, n, W)
+
+        # one segment per member inside this chunk (codes are sorted)
+        seg = np.flatnonzero(np.r_[True, c[1:] != c[:-1]])
+        counts = np.add.reduceat(ok, seg, axis=1, dtype=np.int64)   # (T, segs, W)
+        passes[:, :, c[seg]] += counts.transpose(0, 2, 1)
+
+    return passes
+
+
+def summarize(passes, attempts_per_user, cert_sessions):
+    # -> pass_rate (T, W), members_passing (T, W), certificates (T, W, K);
+    #    the rate is over every stored take, failed ones included
+    total = max(int(attempts_per_user.sum()), 1)
+    pass_rate = passes.sum(axis=-1) / total
+    members_passing = (passes > 0).sum(axis=-1)
+    certificates = (passes[..., None] >= np.asarray(cert_sessions)).sum(axis=-2)
+    return pass_rate, members_passing, certificates
+
+
+# ----------------------------------------------------------
+# 🚀 CLI
+# ----------------------------------------------------------
+def _threshold_vectors(specs):
+    # "85" -> all five metrics; "75:95:5" -> a range of those;
+    # "80,85,85,85,85" -> one per metric (METRIC_COLUMNS order)
+    out = []
+    for spec in specs:
+        if "," in spec:
+            vec = [float(v) for v in spec.split(",")]
+            if len(vec) != len(METRIC_COLUMNS):
+                raise ValueError(f"threshold vector needs {len(METRIC_COLUMNS)} values: {spec}")
+            out.append(vec)
+        elif ":" in spec:
+            lo, hi, step = (float(v) for v in spec.split(":"))
+            out.extend([t] * len(METRIC_COLUMNS) for t in np.arange(lo, hi + step / 2, step))
+        else:
+            out.append([float(spec)] * len(METRIC_COLUMNS))
+    return np.array(out)
+
+
+def _weight_vectors(specs):
+    out = [[float(v) for v in spec.split(",")] for spec in specs]
+    for vec in out:
+        if len(vec) != len(ALPHA_INPUTS):
+            raise ValueError(f"weight vector needs {len(ALPHA_INPUTS)} values ({', '.join(ALPHA_INPUTS)})")
+    return np.array(out)
+
+
+def _fmt(vec):
+    return ",".join(f"{v:g}" for v in vec)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="What-if pass / certificate rates over stored attempts.")
+    parser.add_argument("--db", default=DB_PATH)
+    parser.add_argument("--thresholds", nargs="+", default=[str(CURRENT_THRESHOLD)],
+                        help="85 | 75:95:5 | sub100,chest,gravel,belly,alpha")
+    parser.add_argument("--weights", nargs="+", default=[_fmt(CURRENT_WEIGHTS)],
+                        help="alpha weights over sub100,chest,gravel,belly")
+    parser.add_argument("--cert-sessions", nargs="+", type=int, default=[CURRENT_CERT_SESSIONS],
+                        help="passing attempts needed for a certificate")
+    parser.add_argument("--per-user", action="store_true", help="one row per candidate and member")
+    parser.add_argument("--out", default="-", help="CSV output path (default: stdout)")
+    args = parser.parse_args(argv)
+
+    thresholds = _threshold_vectors(args.thresholds)
+    weights = _weight_vectors(args.weights)
+
+    names, codes, scores, stored = load_attempts(args.db)
+    attempts_per_user = np.bincount(codes, minlength=len(names))
+    stored_per_user = np.bincount(codes, weights=stored, minlength=len(names)).astype(np.int64)
+    stored_rate = stored.sum() / max(len(stored), 1)
+    passes = evaluate(codes, scores, len(names), thresholds, weights)
+    pass_rate, members, certs = summarize(passes, attempts_per_user, args.cert_sessions)
+
+    out = sys.stdout if args.out == "-" else open(args.out, "w", newline="")
+    try:
+        writer = csv.writer(out)
+        if args.per_user:
+            writer.writerow(["thresholds", "weights", "user", "attempts", "stored_passes",
+                             "passes", "pass_rate", *(f"certified_{k}" for k in args.cert_sessions)])
+            for t, tv in enumerate(thresholds):
+                for w, wv in enumerate(weights):
+                    for u, name in enumerate(names):
+                        n, p = int(attempts_per_user[u]), int(passes[t, w, u])
+                        writer.writerow([_fmt(tv), _fmt(wv), name, n, int(stored_per_user[u]), p,
+                                         f"{p / max(n, 1):.4f}",
+                                         *(int(p >= k) for k in args.cert_sessions)])
+        else:
+            writer.writerow(["thresholds", "weights", "attempts", "members", "stored_pass_rate",
+                             "pass_rate", "members_passing",
+                             *(f"certificates_{k}" for k in args.cert_sessions)])
+            for t, tv in enumerate(thresholds):
+                for w, wv in enumerate(weights):
+                    writer.writerow([_fmt(tv), _fmt(wv), len(codes), len(names), f"{stored_rate:.4f}",
+                                     f"{pass_rate[t, w]:.4f}", int(members[t, w]),
+                                     *(int(c) for c in certs[t, w])])
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
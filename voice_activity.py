@@ -0,0 +1,132 @@
+# ==========================================================
+# 🗣 VOICE ACTIVITY DETECTION
+# Energy + zero-crossing gate with an adaptive noise floor
+# ==========================================================
+#
+# Replaces the fixed `peak < 0.02` (live) and `RMS < 0.01` (mic)
+# checks. Each session keeps its own noise floor:
+#
+#   - falls quickly to quieter frames (room gets quiet, mic gain drops)
+#   - creeps up slowly (slower still while "speech" is detected), so a
+#     fan or hum is learned over seconds while speech — louder, bursty
+#     and capped by NOISE_FLOOR_MAX — never becomes the floor
+#
+# A frame is speech when its RMS clears the floor by SNR_RATIO (and an
+# absolute minimum); noisy hiss — high zero-crossing rate with little
+# energy margin — is rejected. A short hangover keeps word tails.
+# The gate costs one dot product + one sign diff per frame, so
+# non-speech frames never reach the FFT.
+#
+# A captured buffer (mask) seeds its floor from its quiet frames — the
+# SEED_PERCENTILE of frame RMS — when it has any, so a soft speaker in a
+# quiet room passes. A take with no quiet part teaches nothing about
+# the room: it falls back to the fixed BASELINE_MIN_RMS gate instead.
+
+import numpy as np
+
+
+# Below this RMS nothing counts as speech (~ -50 dBFS)
+ABS_MIN_RMS = 0.003
+
+# Speech must be this many times the noise floor (~ +9.5 dB)
+SNR_RATIO = 3.0
+
+# The floor never climbs past this (~ -40 dBFS): a long, steady take
+# must not teach the gate that the speaker's own voice is "noise"
+NOISE_FLOOR_MAX = 0.01
+
+# Zero crossings per sample above which a frame looks like hiss …
+ZCR_NOISE = 0.35
+# … unless it is this many times louder than the speech threshold
+ZCR_OVERRIDE = 3.0
+
+# Floor tracking per frame: fast down, slow up
+FLOOR_FALL = 0.2
+FLOOR_RISE = 0.01
+FLOOR_RISE_SPEECH = 0.001
+
+# Keep gating open this long after the last speech frame (seconds)
+HANGOVER_SECONDS = 0.2
+
+# mask(): the floor is seeded from this percentile of frame RMS …
+SEED_PERCENTILE = 10
+# … when the buffer's loud frames clear it by SNR_RATIO; otherwise the
+# take has no silence and frames are gated at this fixed RMS (the old
+# mic-path `RMS < 0.01` check)
+BASELINE_MIN_RMS = 0.01
+
+
+def frame_features(frames):
+    # frames: (n, frame_len) -> (rms, zcr) arrays of length n
+    frames = np.asarray(frames, dtype=np.float32)
+    rms = np.sqrt(np.einsum("ij,ij->i", frames, frames) / frames.shape[1])
+    signs = np.signbit(frames)
+    zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / frames.shape[1]
+    return rms, zcr
+
+
+class EnergyVad:
+
+    # One per session (live processor / mic recording); not thread-safe.
+    # full_scale: amplitude of a 0 dBFS signal — 1.0 for float mic
+    # buffers, 32768 for the raw s16 values WebRTC frames carry.
+
+    def __init__(self, sample_rate, frame_len=1024, noise_floor=ABS_MIN_RMS, full_scale=1.0):
+        self.sample_rate = sample_rate
+        self.frame_len = frame_len
+        self.full_scale = full_scale
+        self.noise_floor = min(max(noise_floor, ABS_MIN_RMS / SNR_RATIO), NOISE_FLOOR_MAX)
+        self.active = False
+        self._hang = 0.0
+        self._pinned = False   # floor fixed at the baseline (mask of a take without silence)
+
+    def _decide(self, rms, zcr, seconds):
+        threshold = max(ABS_MIN_RMS, self.noise_floor * SNR_RATIO)
+        speech = rms > threshold and (zcr < ZCR_NOISE or rms > threshold * ZCR_OVERRIDE)
+
+        if self._pinned:
+            pass
+        elif rms < self.noise_floor:
+            self.noise_floor += FLOOR_FALL * (rms - self.noise_floor)
+        else:
+            rise = FLOOR_RISE_SPEECH if speech else FLOOR_RISE
+            self.noise_floor += rise * (rms - self.noise_floor)
+        self.noise_floor = min(max(self.noise_floor, ABS_MIN_RMS / SNR_RATIO), NOISE_FLOOR_MAX)
+
+        if speech:
+            self._hang = HANGOVER_SECONDS
+        else:
+            self._hang = max(0.0, self._hang - seconds)
+
+        self.active = speech or self._hang > 0
+        return self.active
+
+    def update(self, chunk):
+        # Live path: classify one incoming chunk of any size
+        n = len(chunk)
+        if n == 0:
+            return self.active
+        rms, zcr = frame_features(np.asarray(chunk).reshape(1, n))
+        return self._decide(float(rms[0]) / self.full_scale, float(zcr[0]), n / self.sample_rate)
+
+    def mask(self, signal, seed=True):
+        # Blocking path: per-frame speech mask over a whole buffer.
+        # The floor is seeded from the buffer's quiet frames (or pinned
+        # to the baseline gate when it has none); pass seed=False to
+        # continue from the previous block of one stream.
+        f = self.frame_len
+        n = len(signal) // f
+        if n == 0:
+            return np.zeros(0, dtype=bool)
+
+        rms, zcr = frame_features(np.asarray(signal[:n * f]).reshape(n, f))
+        rms /= self.full_scale
+        if seed:
+            quiet, loud = np.percentile(rms, [SEED_PERCENTILE, 100 - SEED_PERCENTILE])
+            self._pinned = loud <= quiet * SNR_RATIO
+            floor = BASELINE_MIN_RMS / SNR_RATIO if self._pinned else float(quiet)
+            self.noise_floor = min(max(floor, ABS_MIN_RMS / SNR_RATIO), NOISE_FLOOR_MAX)
+
+        seconds = f / self.sample_rate
+        return np.fromiter((self._decide(r, z, seconds) for r, z in zip(rms.tolist(), zcr.tolist())),
+                           dtype=bool, count=n)
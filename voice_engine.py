@@ -3,102 +3,301 @@
 # Streamlit Cloud = SIMULATION
 
 import os
+import queue
 import random
+import threading
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from resonance_dsp import ResonanceScorer, StftRingBuffer, get_pitch_tracker, pitch_score, LAB_PROFILE
+from instrumentation import METRICS, clock, incr, observe
+from voice_activity import EnergyVad
+from result_history import ResultHistory
 
 # Detect cloud deployment
 IS_CLOUD = os.getenv("STREAMLIT_SERVER_PORT") is not None
 
-if not IS_CLOUD:
-    try:
-        import numpy as np
-        import sounddevice as sd
-        REAL_MODE = True
-    except:
-        REAL_MODE = False
-else:
-    REAL_MODE = False
+# sounddevice (and PortAudio behind it) is loaded on the first
+# recording, not when a page imports this module
+_sd = None
+_sd_checked = False
+
+
+def _sounddevice():
+    # -> the sounddevice module, or None in simulation mode
+    global _sd, _sd_checked
+
+    if not _sd_checked:
+        if not IS_CLOUD:
+            try:
+                import sounddevice
+                _sd = sounddevice
+            except:
+                _sd = None
+        _sd_checked = True
+
+    return _sd
+
+
+SAMPLE_RATE = 44100
+
+# Streaming mode: Hann windows of STREAM_WINDOW samples, scored
+# every STREAM_HOP samples (~46 ms at 44.1 kHz, 50% overlap)
+STREAM_WINDOW = 4096
+STREAM_HOP = 2048
+
+# Blocking path: the kept speech is cut into the same STREAM_WINDOW /
+# STREAM_HOP Hann windows as streaming and batch_scoring, this many per
+# rfft call, so every take reuses one scorer's work buffers and the
+# spectral resolution never depends on the take's length
+TAKE_BATCH = 32
+
+# Calibration note: scores used to come from one untapered FFT over the
+# whole take. Its leakage credits steady tones with bands they have no
+# energy in (110 + 220 Hz read sub100 = belly = 100). On voice-like
+# takes the windowed scores agree with it at the drills' 85 bar for
+# 92% of verdicts and pass each metric at least as often, so the bar
+# stays 85; pure tones now score what they contain.
+
+
+def silent_result():
+    return {
+        "sub100":0,
+        "chest":0,
+        "gravel":0,
+        "belly":0,
+        "alpha":0,
+        "pitch":0,
+        "f0":0,
+        "speech_detected":False
+    }
+
+
+def _simulated_result():
+    sub100 = random.randint(45, 85)
+    chest  = random.randint(40, 90)
+    gravel = random.randint(30, 80)
+    belly  = random.randint(35, 75)
 
+    alpha = int((sub100 * 0.5) +
+                (chest * 0.3) +
+                (gravel * 0.2))
 
-def analyze_mic_input(duration=3):
+    f0 = random.randint(80, 160)
+
+    return {
+        "sub100": sub100,
+        "chest": chest,
+        "gravel": gravel,
+        "belly": belly,
+        "alpha": alpha,
+        "pitch": int(pitch_score(f0)),
+        "f0": f0,
+        "speech_detected": True
+    }
+
+
+def score_zones(scorer, zones, total_energy, f0=0.0):
+    # LAB_PROFILE: sub100 x2500, chest x1500, gravel x3000, belly x4000
+    # alpha = sub100*0.5 + chest*0.3 + gravel*0.2
+    res = scorer.to_dict(*scorer.score_zones(zones, total_energy))
+    res['pitch'] = int(pitch_score(f0))
+    res['f0'] = int(round(f0))
+    res['speech_detected'] = True
+    return res
+
+
+_take_scorers = threading.local()
+
+
+def _take_scorer(sample_rate):
+    # One blocking-path scorer per thread (Streamlit session) and rate;
+    # ResonanceScorer is not thread-safe, the pitch tracker is
+    cache = getattr(_take_scorers, "cache", None)
+    if cache is None:
+        cache = _take_scorers.cache = {}
+    scorer = cache.get(sample_rate)
+    if scorer is None:
+        scorer = cache[sample_rate] = ResonanceScorer(LAB_PROFILE, sample_rate, STREAM_WINDOW,
+                                                      taper=True, max_batch=TAKE_BATCH)
+    return scorer
+
+
+def mic_history(duration):
+    # room for one row per streamed hop of a `duration`-second take
+    hops = int(duration * SAMPLE_RATE / STREAM_HOP) + 1
+    fields = tuple(b[0] for b in LAB_PROFILE["bands"]) + ("alpha", "pitch", "f0")
+    return ResultHistory(fields, capacity=hops)
+
+
+def analyze_mic_input(duration=3, on_update=None, history=None):
+
+    # -----------------------------------
+    # 🌊 STREAMING MODE (non-blocking UI)
+    # -----------------------------------
+    # on_update(progress, result) is called once per hop with a running
+    # preview; the returned final result is score_buffer() of the take.
+    # `history` (see mic_history) also receives every hop's own scores.
+    if on_update is not None:
+        result = silent_result()
+        for progress, result in stream_mic_input(duration, history=history):
+            on_update(progress, result)
+        return result
 
     # -----------------------------------
     # 🌐 CLOUD MODE (Simulation)
     # -----------------------------------
-    if not REAL_MODE:
-
-        sub100 = random.randint(45, 85)
-        chest  = random.randint(40, 90)
-        gravel = random.randint(30, 80)
-        belly  = random.randint(35, 75)
-
-        alpha = int((sub100 * 0.5) +
-                    (chest * 0.3) +
-                    (gravel * 0.2))
-
-        return {
-            "sub100": sub100,
-            "chest": chest,
-            "gravel": gravel,
-            "belly": belly,
-            "alpha": alpha,
-            "speech_detected": True
-        }
+    sd = _sounddevice()
+    if sd is None:
+        return _simulated_result()
 
     # -----------------------------------
     # 🖥 LOCAL REAL MIC MODE
     # -----------------------------------
     try:
-        recording = sd.rec(int(duration * 44100),
-                           samplerate=44100,
+        recording = sd.rec(int(duration * SAMPLE_RATE),
+                           samplerate=SAMPLE_RATE,
                            channels=1,
                            dtype='float32')
         sd.wait()
-        audio_data = recording.flatten()
-
-        energy = np.sqrt(np.mean(audio_data**2))
-        if energy < 0.01:
-            return {
-                "sub100":0,
-                "chest":0,
-                "gravel":0,
-                "belly":0,
-                "alpha":0,
-                "speech_detected":False
-            }
-
-        peak = np.max(np.abs(audio_data))
-        if peak > 1e-5:
-            audio_data = audio_data / peak
-
-        fft_data = np.abs(np.fft.rfft(audio_data))
-        freqs = np.fft.rfftfreq(len(audio_data), 1/44100)
-        total_energy = np.sum(fft_data) + 1e-10
-
-        sub_100 = np.sum(fft_data[(freqs >= 50) & (freqs <= 95)])
-        chest_zone = np.sum(fft_data[(freqs >= 150) & (freqs <= 350)])
-        clarity_zone = np.sum(fft_data[(freqs >= 3000) & (freqs <= 5500)])
-        belly_zone = np.sum(fft_data[(freqs >= 20) & (freqs <= 60)])
-
-        res = {
-            'sub100': min(100, int((sub_100 / total_energy) * 2500)),
-            'chest': min(100, int((chest_zone / total_energy) * 1500)),
-            'gravel': min(100, int((clarity_zone / total_energy) * 3000)),
-            'belly': min(100, int((belly_zone / total_energy) * 4000)),
-            'speech_detected': True
-        }
-
-        res['alpha'] = int((res['sub100']*0.5) +
-                           (res['chest']*0.3) +
-                           (res['gravel']*0.2))
-
-        return res
+
+        return score_buffer(recording.flatten())
 
     except:
-        return {
-            "sub100":0,
-            "chest":0,
-            "gravel":0,
-            "belly":0,
-            "alpha":0,
-            "speech_detected":False
-        }
+        return silent_result()
+
+
+def score_buffer(audio_data, sample_rate=SAMPLE_RATE):
+
+    # Score one fully captured mono float buffer (the blocking path)
+    t0 = clock() if METRICS else 0.0
+
+    # VAD: score only the frames that contain speech
+    vad = EnergyVad(sample_rate)
+    speech = vad.mask(audio_data)
+    if not speech.any():
+        if METRICS:
+            incr("mic_buffers_silent")
+        return silent_result()
+
+    f = vad.frame_len
+    audio_data = audio_data[:len(speech) * f].reshape(-1, f)[speech].ravel()
+
+    if len(audio_data) < STREAM_WINDOW:
+        # less speech than one window: score it zero-padded
+        audio_data = np.pad(audio_data, (0, STREAM_WINDOW - len(audio_data)))
+
+    scorer = _take_scorer(sample_rate)
+    tracker = get_pitch_tracker(sample_rate, STREAM_WINDOW)
+
+    # band sums over every window; F0 = median of the voiced windows
+    zones_acc = np.zeros(scorer.n_bands)
+    total_acc = 0.0
+    f0s = []
+    frames = sliding_window_view(audio_data, STREAM_WINDOW)[::STREAM_HOP]
+    for i in range(0, len(frames), TAKE_BATCH):
+        zones, totals = scorer.zones(frames[i:i + TAKE_BATCH])
+        zones_acc += zones.sum(axis=0)
+        total_acc += totals.sum()
+
+        f0, _ = tracker.from_magnitude(scorer.magnitude(len(zones)))
+        f0s.append(f0[f0 > 0])
+
+    voiced = np.concatenate(f0s)
+    f0 = float(np.median(voiced)) if len(voiced) else 0.0
+    result = score_zones(scorer, zones_acc, total_acc, f0)
+
+    if METRICS:
+        observe("mic_analysis_seconds", clock() - t0)
+    return result
+
+
+def stream_mic_input(duration=3, window=STREAM_WINDOW, hop=STREAM_HOP, history=None):
+
+    # Generator: yields (progress 0..1, result) once per hop while the
+    # mic is still capturing — a running preview. The last item has
+    # progress == 1.0 and is score_buffer() of the whole take, so a
+    # streamed take scores exactly as a blocking one would.
+
+    sd = _sounddevice()
+    if sd is None:
+        yield 1.0, _simulated_result()
+        return
+
+    total_samples = int(duration * SAMPLE_RATE)
+    blocks = queue.Queue()
+
+    def _capture(indata, frames, time_info, status):
+        blocks.put(indata[:, 0].copy())
+
+    try:
+        scorer = ResonanceScorer(LAB_PROFILE, SAMPLE_RATE, window)
+        tracker = get_pitch_tracker(SAMPLE_RATE, window)
+        ring = StftRingBuffer(window=window, hop=hop)
+        vad = EnergyVad(SAMPLE_RATE)
+
+        # running band accumulators across all scored windows
+        zones_acc = np.zeros(scorer.n_bands)
+        total_acc = 0.0
+        seen = 0
+
+        # voiced F0 per hop; the result reports their median
+        f0s = []
+        f0 = 0.0
+
+        # the whole take, for the final score_buffer() result
+        take = np.empty(total_samples, dtype=np.float32)
+
+        with sd.InputStream(samplerate=SAMPLE_RATE,
+                            channels=1,
+                            dtype='float32',
+                            blocksize=hop,
+                            callback=_capture):
+
+            while seen < total_samples:
+                block = blocks.get(timeout=1.0)
+                block = block[:total_samples - seen]
+                take[seen:seen + len(block)] = block
+                seen += len(block)
+
+                if vad.update(block):
+                    for windowed in ring.push(block):
+                        t0 = clock() if METRICS else 0.0
+
+                        zones, total = scorer.zones(windowed)
+                        zones_acc += zones
+                        total_acc += total
+
+                        hop_f0, _ = tracker.from_magnitude(scorer.magnitude()[0])
+                        if hop_f0 > 0:
+                            f0s.append(hop_f0)
+                            f0 = float(np.median(f0s))
+
+                        if history is not None and total > 0:
+                            scores, alpha = scorer.score_zones(zones, total)
+                            history.append(scores, alpha, pitch_score(hop_f0 or f0), hop_f0 or f0)
+
+                        if METRICS:
+                            observe("mic_hop_seconds", clock() - t0)
+                else:
+                    # non-speech: keep the ring aligned, skip the FFT
+                    ring.write(block)
+                    if METRICS:
+                        incr("mic_hops_silent")
+
+                if seen == total_samples:
+                    break
+
+                # nothing scored yet = nothing said yet
+                if total_acc == 0:
+                    result = silent_result()
+                else:
+                    result = score_zones(scorer, zones_acc, total_acc, f0)
+
+                yield seen / total_samples, result
+
+        yield 1.0, score_buffer(take)
+
+    except Exception:
+        yield 1.0, silent_result()